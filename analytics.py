@@ -0,0 +1,221 @@
+import functools
+import typing as t
+from collections.abc import Iterable
+from collections.abc import Mapping
+
+import numpy as np
+
+from estimate import DEFAULT_PROFILE
+from plans import Plan
+from plans import plans
+from workouts import HR1
+from workouts import HR2
+from workouts import HR3
+from workouts import HR4
+from workouts import HR5
+from workouts import LT
+from workouts import Workout
+
+ZONES = (None, HR1, HR2, HR3, HR4, HR5)
+"Zone axis of the arrays: steps of an unnumbered zone count in the first one."
+
+PACE = np.array([DEFAULT_PROFILE.other, *DEFAULT_PROFILE.zones])
+"Pace per zone, in seconds per km, to turn distances into durations."
+
+# Intensity of a zone, as a fraction of the lactate threshold: the middle of
+# its bounds.
+INTENSITY = np.array([np.nan] + [sum(zone.ratios) / 2 for zone in ZONES[1:]])
+
+
+@functools.cache
+def lower_workout(workout: Workout) -> np.ndarray:
+    """Seconds and km per zone of `workout`, repeats expanded: shape (2, zones).
+
+    Steps ending on time add up in the first row, steps ending on distance in
+    the second one.
+    """
+    flat = workout.flat()
+    totals = np.zeros((2, len(ZONES)))
+    times = [1] * len(flat)
+    for i in range(len(flat)):
+        parent = flat.parent[i]
+        if parent >= 0:
+            times[i] = times[parent] * flat.count[parent]
+        if flat.kind[i] == flat.REPEAT:
+            continue
+        zone = flat.zone[i] if 0 < flat.zone[i] < len(ZONES) else 0
+        totals[flat.unit[i], zone] += flat.value[i] * times[i]
+    totals.flags.writeable = False
+    return totals
+
+
+class Lowered(t.NamedTuple):
+    """Plans as arrays, one row per (plan, level), weeks padded to the longest.
+
+    `seconds` and `km` are of shape (rows, weeks, 7, zones); `weeks` holds the
+    week numbers of every row, 0 for padding.
+    """
+
+    rows: list[tuple[str, int]]
+    weeks: np.ndarray
+    seconds: np.ndarray
+    km: np.ndarray
+
+    def row(self, plan: str, level: int) -> int:
+        return self.rows.index((plan, level))
+
+    def durations(self, pace: np.ndarray = PACE) -> np.ndarray:
+        # Seconds per zone of every day, distances run at `pace`.
+        return self.seconds + self.km * pace
+
+
+def lower(plans: Mapping[str, Plan] = plans) -> Lowered:
+    rows = [(name, level) for name, plan in plans.items() for level in plan]
+    length = max(len(plans[name][level]) for name, level in rows)
+
+    weeks = np.zeros((len(rows), length), dtype=int)
+    totals = np.zeros((len(rows), length, 7, 2, len(ZONES)))
+    for r, (name, level) in enumerate(rows):
+        for w, (week, days) in enumerate(sorted(plans[name][level].items())):
+            weeks[r, w] = week
+            for d, workout in enumerate(days):
+                if workout is not None:
+                    totals[r, w, d] = lower_workout(workout)
+    return Lowered(rows, weeks, totals[..., 0, :], totals[..., 1, :])
+
+
+def weekly_volume(lowered: Lowered, pace: np.ndarray = PACE) -> np.ndarray:
+    """Minutes run per week: shape (rows, weeks)."""
+    return lowered.durations(pace).sum(axis=(2, 3)) / 60
+
+
+def weekly_distance(lowered: Lowered, pace: np.ndarray = PACE) -> np.ndarray:
+    """Km run per week, durations run at `pace`: shape (rows, weeks)."""
+    return (lowered.km + lowered.seconds / pace).sum(axis=(2, 3))
+
+
+def zone_minutes(lowered: Lowered, pace: np.ndarray = PACE) -> np.ndarray:
+    """Minutes per zone of every week: shape (rows, weeks, zones)."""
+    return lowered.durations(pace).sum(axis=2) / 60
+
+
+def zone_distribution(lowered: Lowered, pace: np.ndarray = PACE) -> np.ndarray:
+    """Share of the time of every plan in each zone: shape (rows, zones)."""
+    minutes = zone_minutes(lowered, pace).sum(axis=1)
+    return minutes / minutes.sum(axis=1, keepdims=True)
+
+
+def trimp(
+    lowered: Lowered,
+    lts: Iterable[int] = (LT,),
+    rest: int = 60,
+    maximum: int = 190,
+    pace: np.ndarray = PACE,
+    a: float = 0.64,
+    b: float = 1.92,
+) -> np.ndarray:
+    """Banister TRIMP of every day for every LT: shape (lts, rows, weeks, 7).
+
+    A zone is run at the middle of its bounds, between the `rest` and
+    `maximum` heart rates. The default coefficients are Banister's for men,
+    use a=0.86 and b=1.67 for women. Unnumbered zones bear no load.
+    """
+    lts = np.asarray(list(lts), dtype=float)
+    hr = lts[:, None] * INTENSITY
+    reserve = np.clip((hr - rest) / (maximum - rest), 0, 1)
+    weight = np.nan_to_num(reserve * a * np.exp(b * reserve))
+    minutes = lowered.durations(pace) / 60
+    return np.einsum("rwdz,lz->lrwd", minutes, weight)
+
+
+def acwr(load: np.ndarray, acute: int = 7, chronic: int = 28) -> np.ndarray:
+    """Acute:chronic workload ratio of every day: same shape as `load`.
+
+    Ratio of the mean daily load of the last `acute` days to the one of the
+    last `chronic` days, the days before the plan counting as rest. NaN while
+    the chronic load is 0.
+    """
+    days = load.reshape(*load.shape[:-2], -1)
+    total = np.cumsum(days, axis=-1)
+    padded = np.concatenate([np.zeros((*total.shape[:-1], chronic)), total], -1)
+    end = padded[..., chronic:]
+    acute_load = (end - padded[..., chronic - acute : -acute]) / acute
+    chronic_load = (end - padded[..., :-chronic]) / chronic
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(chronic_load > 0, acute_load / chronic_load, np.nan)
+    return ratio.reshape(load.shape)
+
+
+class Sweep(t.NamedTuple):
+    lts: np.ndarray
+    rows: list[tuple[str, int]]
+    weekly_load: np.ndarray
+    "TRIMP per week: shape (lts, rows, weeks)."
+    peak_acwr: np.ndarray
+    "Highest acute:chronic ratio of the plan: shape (lts, rows)."
+
+
+def sweep(
+    lts: Iterable[int] = range(150, 191),
+    lowered: Lowered | None = None,
+    **kwargs: t.Any,
+) -> Sweep:
+    """Load of every plan and level for every LT of `lts`.
+
+    Keyword arguments are passed to trimp().
+    """
+    lowered = lowered or lower()
+    lts = np.asarray(list(lts))
+    load = trimp(lowered, lts, **kwargs)
+    # Ratios of the first weeks only compare to rest.
+    ratios = acwr(load)[..., 4:, :]
+    return Sweep(
+        lts,
+        lowered.rows,
+        load.sum(axis=-1),
+        np.nanmax(ratios.reshape(*ratios.shape[:2], -1), axis=-1),
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("plan", choices=sorted(plans))
+    parser.add_argument("level", type=int)
+    parser.add_argument(
+        "--week",
+        type=int,
+        help="Show the minutes per zone of this week only.",
+    )
+    parser.add_argument(
+        "--lt",
+        default=LT,
+        metavar="BPM",
+        type=int,
+        help=f"Lactate threshold heart rate (default: {LT}).",
+    )
+    args = parser.parse_args()
+
+    lowered = lower()
+    r = lowered.row(args.plan, args.level)
+    minutes = zone_minutes(lowered)[r]
+    names = ["Other"] + [zone.name for zone in ZONES[1:]]
+
+    if args.week is not None:
+        w = list(lowered.weeks[r]).index(args.week)
+        for name, value in zip(names, minutes[w]):
+            print(f"{name:>16}: {value:6.0f} min")
+        raise SystemExit
+
+    volume = weekly_volume(lowered)[r]
+    load = trimp(lowered, [args.lt])[0, r]
+    ratio = acwr(load)
+    print(f"{'week':>4} {'min':>5} {'km':>5} {'TRIMP':>6} {'ACWR':>5}")
+    distance = weekly_distance(lowered)[r]
+    for w, week in enumerate(lowered.weeks[r]):
+        if week:
+            print(
+                f"{week:4d} {volume[w]:5.0f} {distance[w]:5.1f}"
+                f" {load[w].sum():6.0f} {ratio[w, -1]:5.2f}"
+            )
@@ -0,0 +1,237 @@
+import itertools
+import logging
+import os
+import time
+import tomllib
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+import workouts
+from bundle import Bundle
+from bundle import Compiled
+from cache import WorkoutCache
+from garmin import GarminConnect
+from garmin import GarminSerializer
+from garmin import RateLimiter
+from garmin import ScheduleResult
+from plans import plans
+from workouts import Workout
+
+
+class Athlete(t.NamedTuple):
+    name: str
+    token: Path
+    cookies: Path
+    plan: str
+    level: int
+    first_week: int
+    last_week: int
+    start: date
+    lt: int
+
+    def workouts(
+        self, bundle: Bundle | None = None
+    ) -> t.Iterator[Workout | Compiled | None]:
+        if bundle is not None and self.lt in bundle.lts(self.plan):
+            # Already compiled for this lactate threshold.
+            weeks = bundle.plan(self.plan, self.lt)[self.level]
+            return itertools.chain.from_iterable(
+                weeks[i] for i in range(self.first_week, self.last_week + 1)
+            )
+
+        weeks = plans[self.plan][self.level]
+        days = itertools.chain.from_iterable(
+            weeks[i] for i in range(self.first_week, self.last_week + 1)
+        )
+        return (None if w is None else w.at(self.lt) for w in days)
+
+
+def read_manifest(path: str | os.PathLike) -> list[Athlete]:
+    """Read the athletes of a TOML manifest.
+
+    ```toml
+    [[athlete]]
+    name = "alice"
+    token = "alice/token"
+    cookies = "alice/cookies"
+    plan = "marathon"
+    level = 1
+    first_week = 1  # optional, defaults to the first week of the plan
+    last_week = 4   # optional, defaults to the last week of the plan
+    start = 2024-12-09
+    lt = 177        # optional, lactate threshold heart rate (local only)
+    ```
+
+    Paths are relative to the manifest.
+    """
+    path = Path(path)
+    with open(path, "rb") as f:
+        manifest = tomllib.load(f)
+
+    athletes = []
+    for entry in manifest.get("athlete", []):
+        name = entry["name"]
+        plan = entry["plan"]
+        if plan not in plans:
+            raise ValueError(f"{name}: unknown plan {plan!r}")
+        level = entry["level"]
+        if level not in plans[plan]:
+            raise ValueError(f"{name}: no level {level} in plan {plan!r}")
+        weeks = plans[plan][level]
+        athletes.append(
+            Athlete(
+                name=name,
+                token=path.parent / entry["token"],
+                cookies=path.parent / entry["cookies"],
+                plan=plan,
+                level=level,
+                first_week=entry.get("first_week", min(weeks)),
+                last_week=entry.get("last_week", max(weeks)),
+                start=entry["start"],
+                lt=entry.get("lt", workouts.LT),
+            )
+        )
+    return athletes
+
+
+class Summary(t.NamedTuple):
+    athletes: int
+    failed_athletes: int
+    scheduled: int
+    failed: int
+    requests: int
+    elapsed: float
+
+    def __str__(self) -> str:
+        return (
+            f"{self.athletes} athletes ({self.failed_athletes} failed), "
+            f"{self.scheduled} days scheduled ({self.failed} failed), "
+            f"{self.requests} requests in {self.elapsed:.1f}s: "
+            f"{self.scheduled / self.elapsed:.1f} days/s, "
+            f"{self.requests / self.elapsed:.1f} requests/s"
+        )
+
+
+def run(
+    athletes: list[Athlete],
+    parallel: int = 4,
+    concurrency: int = 4,
+    cache: str | os.PathLike | None = None,
+    bundle: Bundle | None = None,
+    rate: float = 10.0,
+    logger: logging.Logger = logging.getLogger(__name__),
+) -> Summary:
+    # A single serializer: every athlete reuses the payloads of the others.
+    serializer = GarminSerializer()
+    if bundle is not None:
+        serializer.preload(bundle.payloads)
+
+    def schedule(athlete: Athlete) -> tuple[list[ScheduleResult], int]:
+        client = GarminConnect(
+            token=athlete.token.read_text(),
+            cookies=athlete.cookies.read_text(),
+            logger=logger.getChild(athlete.name),
+            cache=WorkoutCache(cache, account=athlete.name) if cache else None,
+            serializer=serializer,
+            pool_size=max(10, concurrency),
+            limiter=RateLimiter(rate=rate),
+        )
+        client.load()
+        results = client.schedule_many_parallel(
+            athlete.workouts(bundle),
+            start_date=athlete.start,
+            max_workers=concurrency,
+        )
+        return results, client.connection_stats().requests
+
+    start = time.monotonic()
+    scheduled = failed = requests = failed_athletes = 0
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        futures = {athlete: pool.submit(schedule, athlete) for athlete in athletes}
+        for athlete, future in futures.items():
+            if future.exception() is not None:
+                logger.error("%s: %r", athlete.name, future.exception())
+                failed_athletes += 1
+                continue
+            results, sent = future.result()
+            errors = sum(result.error is not None for result in results)
+            logger.info(
+                "%s: %d days scheduled, %d failed.",
+                athlete.name,
+                len(results) - errors,
+                errors,
+            )
+            scheduled += len(results) - errors
+            failed += errors
+            requests += sent
+    elapsed = time.monotonic() - start
+
+    logger.info("Serializer: %s", serializer.cache_info())
+    return Summary(len(athletes), failed_athletes, scheduled, failed, requests, elapsed)
+
+
+if __name__ == "__main__":
+    log_level = os.getenv("LOG_LEVEL", "WARNING").upper()
+    logging.basicConfig(level=log_level)
+
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "manifest",
+        metavar="FILE",
+        help="TOML manifest of the athletes to schedule.",
+    )
+    parser.add_argument(
+        "-p",
+        "--parallel",
+        default=4,
+        metavar="N",
+        type=int,
+        help="Number of athletes scheduled in parallel (default: 4).",
+    )
+    parser.add_argument(
+        "-j",
+        "--concurrency",
+        default=4,
+        metavar="N",
+        type=int,
+        help="Number of concurrent requests per athlete (default: 4).",
+    )
+    parser.add_argument(
+        "-r",
+        "--rate",
+        default=10.0,
+        metavar="N",
+        type=float,
+        help="Maximum requests per second per athlete, lowered whenever the"
+        " service throttles (default: 10).",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="FILE",
+        help="SQLite file caching the remote workouts of every athlete.",
+    )
+    parser.add_argument(
+        "--bundle",
+        metavar="FILE",
+        help="Bundle of precompiled plans, see bundle.py.",
+    )
+    args = parser.parse_args()
+
+    bundle = Bundle(args.bundle) if args.bundle else None
+    if bundle is not None and not bundle.matches():
+        parser.error(
+            f"{args.bundle} was compiled from other plans, rebuild it with bundle.py"
+        )
+    summary = run(
+        read_manifest(args.manifest),
+        parallel=args.parallel,
+        concurrency=args.concurrency,
+        cache=args.cache,
+        bundle=bundle,
+        rate=args.rate,
+    )
+    print(summary)
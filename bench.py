@@ -0,0 +1,123 @@
+import argparse
+import itertools
+import timeit
+from collections.abc import Callable
+
+from garmin import JSON_BACKENDS
+from garmin import GarminSerializer
+from plans import half_marathon
+from plans import marathon
+from plans import referenced
+from workouts import Cooldown
+from workouts import HR2
+from workouts import HR4
+from workouts import min as minutes
+from workouts import Recovery
+from workouts import Repeat
+from workouts import Segment
+from workouts import Step
+from workouts import Warmup
+from workouts import Workout
+
+
+def catalog() -> list[Workout]:
+    return referenced(marathon, half_marathon)
+
+
+def flat(size: int) -> Workout:
+    steps = [Segment(minutes(1 + i % 5), HR2 if i % 2 else HR4) for i in range(size)]
+    return Workout([Warmup(), *steps, Cooldown()], name=f"Flat {size}")
+
+
+def ladder(size: int) -> Workout:
+    # Repeats nested size / 3 deep, each of an interval, a recovery and the
+    # next level.
+    step: Step = Segment(minutes(1), HR4)
+    for i in range(size // 3):
+        step = Repeat(2, [Segment(minutes(1 + i % 5), HR4), Recovery(), step])
+    return Workout([Warmup(), step, Cooldown()], name=f"Ladder {size}")
+
+
+def bench(
+    name: str, func: Callable[[Workout], object], workouts: list[Workout], number: int
+) -> float:
+    best = min(
+        timeit.repeat(lambda: [func(w) for w in workouts], number=number, repeat=5)
+    )
+    per_workout = best / number / len(workouts)
+    print(f"{name:>12}: {per_workout * 1e6:8.2f} us/workout")
+    return per_workout
+
+
+def bench_serializer(number: int, backend: str | None) -> None:
+    workouts = catalog()
+    serializer = GarminSerializer(backend=backend)
+
+    for workout in workouts:
+        assert serializer.serialize(workout) == serializer.serialize_reference(
+            workout
+        ), workout.name
+
+    def reference_steps(workout: Workout) -> list[dict]:
+        stepId = itertools.count(1)
+        return [serializer._serialize(step, stepId) for step in workout.steps]
+
+    def compiled_steps(workout: Workout) -> list[dict]:
+        return serializer._compiled(workout.flat())
+
+    print(f"Serialize {len(workouts)} unique workouts of marathon/half_marathon")
+    print("Steps only")
+    reference = bench("reference", reference_steps, workouts, number)
+    compiled = bench("compiled", compiled_steps, workouts, number)
+    print(f"{'speedup':>12}: {reference / compiled:8.2f}x")
+    print("Full payload")
+    reference = bench("reference", serializer.serialize_reference, workouts, number)
+    compiled = bench("compiled", serializer.serialize, workouts, number)
+    print(f"{'speedup':>12}: {reference / compiled:8.2f}x")
+
+
+def bench_scaling(sizes: list[int], number: int, backend: str | None) -> None:
+    serializer = GarminSerializer(backend=backend)
+
+    print("Serialize generated workouts, whole payload")
+    for size in sizes:
+        for workout in flat(size), ladder(size):
+            compiled = bench(workout.name, serializer.serialize, [workout], number)
+            try:
+                reference = serializer.serialize_reference(workout)
+            except RecursionError:
+                print(f"{'reference':>12}: recursion limit")
+                continue
+            assert reference == serializer.serialize(workout), workout.name
+            reference = bench(
+                "reference", serializer.serialize_reference, [workout], number
+            )
+            print(f"{'speedup':>12}: {reference / compiled:8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n",
+        "--number",
+        default=100,
+        type=int,
+        help="Number of passes over the catalog per measure (default: 100).",
+    )
+    parser.add_argument(
+        "-b",
+        "--backend",
+        choices=sorted(JSON_BACKENDS),
+        help="JSON encoder (default: the fastest installed).",
+    )
+    parser.add_argument(
+        "--scaling",
+        action="store_true",
+        help="Serialize generated workouts of up to thousands of steps instead.",
+    )
+    args = parser.parse_args()
+
+    if args.scaling:
+        bench_scaling([10, 100, 1000, 5000], max(1, args.number // 10), args.backend)
+    else:
+        bench_serializer(args.number, args.backend)
@@ -0,0 +1,179 @@
+import json
+import mmap
+import os
+import struct
+import typing as t
+from collections.abc import Iterable
+from collections.abc import Mapping
+
+from garmin import GarminSerializer
+from plans import Plan
+from plans import plans
+from workouts import LT
+from workouts import Workout
+from workouts import content_digest
+
+MAGIC = b"GCBUNDLE"
+HEADER = struct.Struct("<8sQ")
+"Magic and length of the JSON index that follows it; the payloads come last."
+
+
+class Compiled(t.NamedTuple):
+    """A workout of a bundle, standing in for a Workout.
+
+    Saving and scheduling only need the name and the payload key of a workout,
+    the payload comes from the bundle.
+    """
+
+    name: str
+    key: str
+
+    def payload_key(self) -> str:
+        return self.key
+
+
+type CompiledPlan = dict[int, dict[int, list[Compiled | None]]]
+
+
+def plans_digest(plans: Mapping[str, Plan] = plans) -> str:
+    """Digest of the workouts of every day of `plans`.
+
+    A bundle records the digest of the plans it was compiled from, to tell
+    when it is out of date.
+    """
+    return content_digest(
+        *(
+            (name, level, week, *(None if w is None else w.digest for w in days))
+            for name, plan in plans.items()
+            for level, weeks in plan.items()
+            for week, days in weeks.items()
+        )
+    )
+
+
+def build(
+    path: str | os.PathLike,
+    lts: Iterable[int] = (LT,),
+    plans: Mapping[str, Plan] = plans,
+    serializer: GarminSerializer | None = None,
+) -> int:
+    """Compile `plans` for every lactate threshold of `lts` into a bundle.
+
+    Return the number of unique workouts in the bundle.
+    """
+    serializer = serializer or GarminSerializer()
+
+    workouts: dict[str, int] = {}
+    entries: list[tuple[str, str, int, int]] = []
+    blobs: list[bytes] = []
+    offset = 0
+
+    def add(workout: Workout) -> int:
+        nonlocal offset
+        # The instances of a workout at several lactate thresholds usually
+        # share their payload.
+        key = workout.payload_key()
+        if key not in workouts:
+            data = serializer.serialize(workout)
+            workouts[key] = len(entries)
+            entries.append((workout.name, key, offset, len(data)))
+            blobs.append(data)
+            offset += len(data)
+        return workouts[key]
+
+    compiled: dict[str, dict[int, dict[int, dict[int, list[int | None]]]]] = {}
+    for name, plan in plans.items():
+        compiled[name] = {}
+        for lt in lts:
+            compiled[name][lt] = {
+                level: {
+                    week: [None if w is None else add(w.at(lt)) for w in days]
+                    for week, days in weeks.items()
+                }
+                for level, weeks in plan.items()
+            }
+
+    index = json.dumps(
+        {"digest": plans_digest(plans), "workouts": entries, "plans": compiled}
+    ).encode()
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(index)))
+        f.write(index)
+        f.writelines(blobs)
+    return len(entries)
+
+
+class Bundle:
+    """Read-only, memory-mapped bundle of compiled plans and their payloads.
+
+    Opening a bundle only parses its index: processes mapping the same file
+    share its pages, and the payloads are sent straight from the mapping.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, size = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path}: not a workout bundle")
+        index = json.loads(self._mmap[HEADER.size : HEADER.size + size])
+        blobs = memoryview(self._mmap)[HEADER.size + size :]
+
+        self.workouts = [Compiled(name, key) for name, key, *_ in index["workouts"]]
+        self.payloads: dict[str, memoryview] = {
+            key: blobs[offset : offset + length]
+            for _, key, offset, length in index["workouts"]
+        }
+        self._plans: dict[str, dict[str, t.Any]] = index["plans"]
+        self.digest: str | None = index.get("digest")
+        blobs.release()
+
+    def matches(self, plans: Mapping[str, Plan] = plans) -> bool:
+        # Whether the bundle was compiled from `plans` as they are now.
+        return self.digest == plans_digest(plans)
+
+    def close(self) -> None:
+        for payload in self.payloads.values():
+            payload.release()
+        self._mmap.close()
+
+    def plans(self) -> list[str]:
+        return list(self._plans)
+
+    def lts(self, plan: str) -> list[int]:
+        return [int(lt) for lt in self._plans.get(plan, {})]
+
+    def plan(self, name: str, lt: int = LT) -> CompiledPlan:
+        return {
+            int(level): {
+                int(week): [None if i is None else self.workouts[i] for i in days]
+                for week, days in weeks.items()
+            }
+            for level, weeks in self._plans[name][str(lt)].items()
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "bundle",
+        metavar="FILE",
+        help="Bundle to write.",
+    )
+    parser.add_argument(
+        "--lt",
+        action="append",
+        metavar="BPM",
+        type=int,
+        help=f"Lactate threshold heart rate to compile the plans for (default: {LT})."
+        " May be repeated.",
+    )
+    args = parser.parse_args()
+
+    count = build(args.bundle, lts=args.lt or (LT,))
+    print(f"{count} workouts, {os.path.getsize(args.bundle)} bytes")
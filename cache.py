@@ -0,0 +1,115 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+
+
+class WorkoutCache:
+    """Local copy of the remote workouts index of an account.
+
+    Maps workout names to their Garmin ids and the digest of the uploaded
+    content, so that a run does not have to download the whole workout list.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS workouts (
+            account TEXT NOT NULL,
+            workout_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            digest TEXT,
+            PRIMARY KEY (account, workout_id)
+        );
+        CREATE TABLE IF NOT EXISTS accounts (
+            account TEXT PRIMARY KEY,
+            synced REAL NOT NULL
+        );
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        account: str,
+        max_age: timedelta = timedelta(days=1),
+    ) -> None:
+        self.account = account
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.executescript(self.SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def stale(self) -> bool:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT synced FROM accounts WHERE account = ?", (self.account,)
+            ).fetchone()
+        return row is None or time.time() - row[0] > self.max_age.total_seconds()
+
+    def invalidate(self) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM accounts WHERE account = ?", (self.account,))
+
+    def workouts(self) -> dict[str, list[int]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT name, workout_id FROM workouts "
+                "WHERE account = ? ORDER BY rowid",
+                (self.account,),
+            ).fetchall()
+        workouts: dict[str, list[int]] = {}
+        for name, workoutId in rows:
+            workouts.setdefault(name, []).append(workoutId)
+        return workouts
+
+    def digests(self) -> dict[str, str]:
+        # Digest of the current, last, upload of every name, when known.
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT name, digest FROM workouts WHERE account = ? ORDER BY rowid",
+                (self.account,),
+            ).fetchall()
+        digests: dict[str, str | None] = dict(rows)
+        return {name: digest for name, digest in digests.items() if digest is not None}
+
+    def replace(self, workouts: dict[str, list[int]]) -> None:
+        # Digests of workouts we uploaded ourselves survive a resync.
+        with self._lock, self._db:
+            digests = dict(
+                self._db.execute(
+                    "SELECT workout_id, digest FROM workouts WHERE account = ?",
+                    (self.account,),
+                )
+            )
+            self._db.execute("DELETE FROM workouts WHERE account = ?", (self.account,))
+            self._db.executemany(
+                "INSERT INTO workouts VALUES (?, ?, ?, ?)",
+                (
+                    (self.account, workoutId, name, digests.get(workoutId))
+                    for name, workoutIds in workouts.items()
+                    for workoutId in workoutIds
+                ),
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO accounts VALUES (?, ?)",
+                (self.account, time.time()),
+            )
+
+    def add(self, name: str, workoutId: int, digest: str | None = None) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO workouts VALUES (?, ?, ?, ?)",
+                (self.account, workoutId, name, digest),
+            )
+
+    def remove(self, workoutId: int) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM workouts WHERE account = ? AND workout_id = ?",
+                (self.account, workoutId),
+            )
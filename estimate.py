@@ -0,0 +1,151 @@
+import functools
+import typing as t
+from array import array
+from collections.abc import Mapping
+
+from workouts import Workout
+
+
+class PaceProfile(t.NamedTuple):
+    """Pace of an athlete in every HR zone, in seconds per km."""
+
+    zones: tuple[float, ...]
+    "Pace in zone n at index n - 1."
+    other: float = 360.0
+    "Pace in zones without a number."
+
+    def pace(self, zone: int) -> float:
+        # Zone numbers as in FlatSteps: -1 for none.
+        if 0 < zone <= len(self.zones):
+            return self.zones[zone - 1]
+        return self.other
+
+    def with_pace(self, zone: int, pace: float) -> "PaceProfile":
+        if not 1 <= zone <= len(self.zones):
+            raise ValueError(f"No HR zone {zone}, zones are 1 to {len(self.zones)}")
+        zones = list(self.zones)
+        zones[zone - 1] = pace
+        return self._replace(zones=tuple(zones))
+
+
+DEFAULT_PROFILE = PaceProfile((400.0, 370.0, 330.0, 300.0, 270.0))
+"Rough paces, from 6:40/km in HR1 to 4:30/km in HR5."
+
+
+def parse_pace(pace: str) -> float:
+    """Seconds per km of a "m:ss" pace."""
+    minutes, _, seconds = pace.partition(":")
+    return int(minutes) * 60 + float(seconds or 0)
+
+
+def format_pace(pace: float) -> str:
+    return f"{int(pace // 60)}:{round(pace % 60):02d}"
+
+
+class Estimate(t.NamedTuple):
+    seconds: float
+    km: float
+
+    @classmethod
+    def sum(cls, estimates: t.Iterable["Estimate"]) -> "Estimate":
+        seconds = km = 0.0
+        for estimate in estimates:
+            seconds += estimate.seconds
+            km += estimate.km
+        return cls(seconds, km)
+
+    def __str__(self) -> str:
+        minutes = round(self.seconds / 60)
+        return f"{minutes // 60}h{minutes % 60:02d} {self.km:.1f}km"
+
+
+class StepEstimates(t.NamedTuple):
+    """Time and distance of every step of a FlatSteps, and of the workout.
+
+    A segment counts once, a repeat counts all the iterations of its steps.
+    """
+
+    seconds: array
+    km: array
+    total: Estimate
+
+
+@functools.cache
+def estimate_steps(
+    workout: Workout, profile: PaceProfile = DEFAULT_PROFILE
+) -> StepEstimates:
+    flat = workout.flat()
+    seconds = array("d", [0.0]) * len(flat)
+    km = array("d", [0.0]) * len(flat)
+    total = [0.0, 0.0]
+    # Backwards, the steps of a repeat are summed up before the repeat itself.
+    for i in reversed(range(len(flat))):
+        if flat.kind[i] == flat.REPEAT:
+            seconds[i] *= flat.count[i]
+            km[i] *= flat.count[i]
+        elif flat.unit[i] == flat.TIME:
+            seconds[i] = flat.value[i]
+            km[i] = flat.value[i] / profile.pace(flat.zone[i])
+        else:
+            seconds[i] = flat.value[i] * profile.pace(flat.zone[i])
+            km[i] = flat.value[i]
+
+        parent = flat.parent[i]
+        if parent >= 0:
+            seconds[parent] += seconds[i]
+            km[parent] += km[i]
+        else:
+            total[0] += seconds[i]
+            total[1] += km[i]
+    return StepEstimates(seconds, km, Estimate(*total))
+
+
+def estimate(workout: Workout, profile: PaceProfile = DEFAULT_PROFILE) -> Estimate:
+    """Time and distance of `workout` at the paces of `profile`."""
+    return estimate_steps(workout, profile).total
+
+
+def estimate_weeks(
+    weeks: Mapping[int, list[Workout | None]],
+    profile: PaceProfile = DEFAULT_PROFILE,
+) -> dict[int, Estimate]:
+    """Time and distance of every week of a plan level."""
+    return {
+        week: Estimate.sum(estimate(w, profile) for w in days if w is not None)
+        for week, days in weeks.items()
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from plans import plans
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("plan", choices=sorted(plans))
+    parser.add_argument("level", type=int)
+    parser.add_argument(
+        "--pace",
+        action="append",
+        default=[],
+        metavar="ZONE=M:SS",
+        help="Pace per km in an HR zone, e.g. 2=5:45. May be repeated.",
+    )
+    args = parser.parse_args()
+
+    profile = DEFAULT_PROFILE
+    for pace in args.pace:
+        zone, _, value = pace.partition("=")
+        try:
+            profile = profile.with_pace(int(zone), parse_pace(value))
+        except ValueError as e:
+            parser.error(f"--pace {pace}: {e}")
+    print(
+        "Paces: "
+        + ", ".join(f"HR{n} {format_pace(p)}" for n, p in enumerate(profile.zones, 1))
+    )
+
+    weeks = estimate_weeks(plans[args.plan][args.level], profile)
+    for week, total in weeks.items():
+        print(f"{week:4d} {total!s}")
+    print(f"Total {Estimate.sum(weeks.values())!s}")
@@ -1,18 +1,43 @@
+import asyncio
+import contextlib
+import contextvars
+import email.utils
 import enum
 import functools
 import itertools
 import json
 import logging
 import os
+import random
+import threading
+import time
 import typing as t
+from collections import OrderedDict
 from collections import defaultdict
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from datetime import timedelta
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from plans import marathon
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+from cache import WorkoutCache
+from journal import Entry
+from journal import Journal
 from workouts import Cooldown
+from workouts import FlatSteps
+from workouts import LT
 from workouts import Recovery
 from workouts import Repeat
 from workouts import Segment
@@ -152,13 +177,182 @@ def make_targetType(seg: Segment) -> dict[str, t.Any]:
     return dct
 
 
+def stdlib_dumps(obj: t.Any) -> bytes:
+    return json.dumps(obj).encode()
+
+
+def compact_dumps(obj: t.Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+@functools.cache
+def separators(dumps: t.Callable[[t.Any], bytes]) -> tuple[bytes, bytes]:
+    # The item and key separators written by `dumps`.
+    return dumps([0, 0])[2:-2], dumps({"": 0})[3:-2]
+
+
+def iterative_dumps(
+    obj: t.Any, dumps: t.Callable[[t.Any], bytes] = compact_dumps
+) -> bytes:
+    """JSON of `obj`, nested deeper than the recursive encoders support.
+
+    Lists, and the dicts holding lists, are walked without recursion: the
+    other values, shallow in a payload, are encoded by `dumps`, and the
+    separators match its own.
+    """
+    comma, colon = separators(dumps)
+    parts: list[bytes] = []
+    # Values left to encode, and the bytes between them.
+    stack: list[t.Any] = [obj]
+    while stack:
+        item = stack.pop()
+        if item.__class__ is bytes:
+            parts.append(item)
+        elif item.__class__ is list:
+            parts.append(b"[")
+            stack.append(b"]")
+            items: list[t.Any] = []
+            for value in item:
+                items.append(comma)
+                items.append(value)
+            stack.extend(reversed(items[1:]))
+        elif item.__class__ is dict and any(
+            value.__class__ is list for value in item.values()
+        ):
+            # The members up to each list are encoded at once.
+            items = []
+            text = b"{"
+            for key, value in item.items():
+                text += dumps(key) + colon
+                if value.__class__ is list:
+                    items.append(text)
+                    items.append(value)
+                    text = comma
+                else:
+                    text += dumps(value) + comma
+            items.append(text[: -len(comma)] + b"}")
+            stack.extend(reversed(items))
+        else:
+            parts.append(dumps(item))
+    return b"".join(parts)
+
+
+JSON_BACKENDS: dict[str, t.Callable[[t.Any], bytes]] = {"json": stdlib_dumps}
+if msgspec is not None:
+    JSON_BACKENDS["msgspec"] = msgspec.json.encode
+if orjson is not None:
+    JSON_BACKENDS["orjson"] = orjson.dumps
+
+
+def json_backend(name: str | None = None) -> t.Callable[[t.Any], bytes]:
+    # Default to the fastest encoder installed.
+    if name is None:
+        name = next(n for n in ("orjson", "msgspec", "json") if n in JSON_BACKENDS)
+    try:
+        return JSON_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"JSON backend {name!r} is not available") from None
+
+
+class StepFragment(t.NamedTuple):
+    stepType: dict[str, int]
+    targeted: bool
+
+
+# Constant parts of the payloads, shared by every serialized step.
+HEART_RATE_TARGET = {"workoutTargetTypeId": TargetType.HEART_RATE.value}
+TIME_END = {"conditionTypeId": EndCondition.TIME.value}
+DISTANCE_END = {"conditionTypeId": EndCondition.DISTANCE.value}
+ITERATIONS_END = {"conditionTypeId": EndCondition.ITERATIONS.value}
+REPEAT_TYPE = {"stepTypeId": StepType.REPEAT.value}
+
+
+@functools.cache
+def compile_step(cls: type[Segment]) -> StepFragment:
+    """Static part of the payload of every step of class `cls`.
+
+    Mirrors getType() and make_targetType(), once per class instead of once
+    per step.
+    """
+    if issubclass(cls, Warmup):
+        stepType = StepType.WARMUP
+    elif issubclass(cls, Cooldown):
+        stepType = StepType.COOLDOWN
+    elif issubclass(cls, Recovery):
+        stepType = StepType.RECOVERY
+    else:
+        stepType = StepType.INTERVAL
+    targeted = not issubclass(cls, (Warmup, Cooldown, Recovery))
+    return StepFragment({"stepTypeId": stepType.value}, targeted)
+
+
+class CacheInfo(t.NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
 class GarminSerializer:
-    def __init__(self) -> None:
-        self.stepId = itertools.count(1)
+    def __init__(self, maxsize: int = 1024, backend: str | None = None) -> None:
+        self.dumps = json_backend(backend)
+
+        # Encoded payloads, keyed by workout payload key, in LRU order.
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[str, bytes] = OrderedDict()
+        self._preloaded: dict[str, bytes | memoryview] = {}
+        self._lock = threading.Lock()
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._cache))
 
-    def serialize(self, workout: Workout) -> str:
-        # stepId count is local to the current Workout
-        self.stepId = itertools.count(1)
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+    def preload(self, payloads: t.Mapping[str, bytes | memoryview]) -> None:
+        """Use `payloads`, keyed by workout payload key, instead of serializing.
+
+        Preloaded payloads are never evicted.
+        """
+        with self._lock:
+            self._preloaded.update(payloads)
+
+    def encode(self, workout: Workout) -> bytes | memoryview:
+        key = workout.payload_key()
+        with self._lock:
+            data = self._preloaded.get(key)
+            if data is None:
+                data = self._cache.get(key)
+                if data is not None:
+                    self._cache.move_to_end(key)
+            if data is not None:
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        data = self.serialize(workout)
+        with self._lock:
+            self._cache[key] = data
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return data
+
+    def serialize(self, workout: Workout) -> bytes:
+        return self._dumps(workout, self._compiled(workout.flat()))
+
+    def serialize_reference(self, workout: Workout) -> bytes:
+        # Generic, dispatch based serialization: the reference the compiled
+        # path must match byte for byte.
+        stepId = itertools.count(1)
+        steps = [self._serialize(seg, stepId) for seg in workout.steps]
+        return self._dumps(workout, steps)
+
+    def _dumps(self, workout: Workout, steps: list[dict]) -> bytes:
         dct = {
             "sportType": {
                 "sportTypeId": SportType.RUNNING.value,
@@ -169,22 +363,78 @@ class GarminSerializer:
                     "sportType": {
                         "sportTypeId": SportType.RUNNING.value,
                     },
-                    "workoutSteps": [self._serialize(seg) for seg in workout.steps],
+                    "workoutSteps": steps,
                 },
             ],
         }
 
-        return json.dumps(dct)
+        try:
+            return self.dumps(dct)
+        except (TypeError, RecursionError):
+            # Repeats nested deeper than the encoder supports: orjson stops
+            # at 255 levels, about 128 repeats.
+            return iterative_dumps(dct, self.dumps)
+
+    def _compiled(self, flat: FlatSteps) -> list[dict]:
+        # Same payload as _serialize(), with the per-class parts precomputed
+        # by compile_step() and the keys emitted in the same order, in a
+        # single scan of the flattened steps.
+        fragments = [None, *map(compile_step, flat.classes[1:])]
+        serialized: list[dict] = []
+        children: dict[int, list[dict]] = {}
+        for i in range(len(flat)):
+            parent = flat.parent[i]
+            siblings = serialized if parent < 0 else children[parent]
+
+            kind = flat.kind[i]
+            if kind == flat.REPEAT:
+                children[i] = []
+                siblings.append(
+                    {
+                        "type": "RepeatGroupDTO",
+                        "stepOrder": i + 1,
+                        "stepType": REPEAT_TYPE,
+                        "workoutSteps": children[i],
+                        "endCondition": ITERATIONS_END,
+                        "numberOfIterations": flat.count[i],
+                    }
+                )
+                continue
+
+            fragment = fragments[kind]
+            dct = {
+                "type": "ExecutableStepDTO",
+                "stepOrder": i + 1,
+                "stepType": fragment.stepType,
+            }
+            if flat.notes[i] is not None:
+                dct["description"] = flat.notes[i]
+            if fragment.targeted:
+                dct["targetType"] = HEART_RATE_TARGET
+                if flat.zone[i] >= 0:
+                    dct["zoneNumber"] = str(flat.zone[i])
+                else:
+                    dct["targetValueOne"] = flat.low[i]
+                    dct["targetValueTwo"] = flat.high[i]
+            if flat.unit[i] == flat.TIME:
+                dct["endCondition"] = TIME_END
+                dct["endConditionValue"] = int(flat.value[i])
+            else:
+                dct["endCondition"] = DISTANCE_END
+                dct["endConditionValue"] = int(flat.value[i] * 1000)
+            siblings.append(dct)
+
+        return serialized
 
     @functools.singledispatchmethod
-    def _serialize(self, arg) -> dict:
+    def _serialize(self, arg, stepId: t.Iterator[int]) -> dict:
         raise NotImplementedError(f"Cannot serialize a {arg.__class__.__name__}")
 
     @_serialize.register
-    def _(self, step: Segment) -> dict:
+    def _(self, step: Segment, stepId: t.Iterator[int]) -> dict:
         dct = {
             "type": "ExecutableStepDTO",
-            "stepOrder": next(self.stepId),
+            "stepOrder": next(stepId),
             "stepType": {
                 "stepTypeId": getType(step).value,
             },
@@ -197,10 +447,10 @@ class GarminSerializer:
         return dct
 
     @_serialize.register
-    def _(self, repeat: Repeat) -> dict:
+    def _(self, repeat: Repeat, stepId: t.Iterator[int]) -> dict:
         dct = {
             "type": "RepeatGroupDTO",
-            "stepOrder": next(self.stepId),
+            "stepOrder": next(stepId),
             "stepType": {
                 "stepTypeId": getType(repeat).value,
             },
@@ -208,27 +458,225 @@ class GarminSerializer:
         }
         dct.update(make_endCondition(repeat))
         for step in repeat.steps:
-            dct["workoutSteps"].append(self._serialize(step))
+            dct["workoutSteps"].append(self._serialize(step, stepId))
 
         return dct
 
 
+class RateLimiter:
+    """Thread-safe token bucket.
+
+    The refill rate adapts to the service: it is halved whenever the service
+    throttles us and grows back slowly, up to `rate`, as requests succeed.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 10) -> None:
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._updated
+                self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+                self._updated = now
+
+                wait = self._paused_until - now
+                if wait <= 0 and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = max(wait, (1 - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def throttle(self, delay: float) -> None:
+        with self._lock:
+            self.rate = max(self.rate / 2, self.max_rate / 100)
+            self._tokens = 0
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+    def succeed(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 100)
+
+
+def retry_after(response: requests.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+# Monotonic time at which the current batch of requests must be over.
+DEADLINE: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "DEADLINE", default=None
+)
+
+
+def submit[**P, R](
+    pool: Executor, func: t.Callable[P, R], *args: P.args, **kwargs: P.kwargs
+) -> Future[R]:
+    # Run func in the current context, so that it sees the batch DEADLINE.
+    context = contextvars.copy_context()
+    return pool.submit(context.run, func, *args, **kwargs)
+
+
+class ConnectionStats(t.NamedTuple):
+    requests: int
+    connections: int
+
+    @property
+    def reuse(self) -> float:
+        "Share of requests sent over an already open connection."
+        return 1 - self.connections / self.requests if self.requests else 0.0
+
+
+def date_range(start: date, end: date) -> t.Iterator[date]:
+    for i in range((end - start).days + 1):
+        yield start + timedelta(days=i)
+
+
+class ScheduleResult(t.NamedTuple):
+    date: date
+    workout: Workout
+    error: BaseException | None
+
+
+def plan_days(
+    workouts: t.Iterable[Workout | None], start_date: date
+) -> list[tuple[date, Workout]]:
+    return [
+        (start_date + timedelta(days=i), workout)
+        for i, workout in enumerate(workouts)
+        if workout is not None
+    ]
+
+
+class Scheduled(t.NamedTuple):
+    scheduleId: int
+    workoutId: int
+    name: str
+    date: date
+
+
+class ScheduleDiff(t.NamedTuple):
+    add: list[tuple[date, Workout]]
+    remove: list[Scheduled]
+    replace: list[tuple[Scheduled, Workout]]
+
+    def __bool__(self) -> bool:
+        return bool(self.add or self.remove or self.replace)
+
+
+def diff_schedule(
+    workouts: list[Workout | None],
+    start_date: date,
+    remote: t.Mapping[date, list[Scheduled]],
+    current: t.Mapping[str, int | None] | None = None,
+) -> ScheduleDiff:
+    # The calendar is expected to hold exactly the workouts of the plan over
+    # its date range: anything else scheduled on those days is removed.
+    # `current` maps names to the id of their up-to-date upload: a day
+    # scheduled with another id of the workout is replaced. The names it
+    # lacks are matched by name only.
+    current = current or {}
+    diff = ScheduleDiff([], [], [])
+    for i, workout in enumerate(workouts):
+        d = start_date + timedelta(days=i)
+        entries = list(remote.get(d, []))
+
+        if workout is not None:
+            named = [e for e in entries if e.name == workout.name]
+            if workout.name in current:
+                workoutId = current[workout.name]
+                kept = next((e for e in named if e.workoutId == workoutId), None)
+            else:
+                kept = next(iter(named), None)
+            if kept is not None:
+                entries.remove(kept)
+            elif entries:
+                # Replace an outdated upload of the workout first.
+                old = named[0] if named else entries[0]
+                entries.remove(old)
+                diff.replace.append((old, workout))
+            else:
+                diff.add.append((d, workout))
+        diff.remove.extend(entries)
+
+    return diff
+
+
 class GarminConnect:
 
     BASE_URL = "https://connect.garmin.com"
 
+    # Retrying a request that may have been processed is only safe when it is
+    # idempotent. 429 and 503 mean that it was rejected before processing.
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    REJECTED_STATUSES = frozenset({429, 503})
+
     def __init__(
         self,
         token: str,
         cookies: dict[str, str] | str,
         logger: logging.Logger = logging.getLogger(__name__),
+        cache: WorkoutCache | None = None,
+        serializer: GarminSerializer | None = None,
+        limiter: RateLimiter | None = None,
+        retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 60.0,
+        pool_size: int = 10,
+        keep_alive: bool = True,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 30.0,
+        deadline: float | None = None,
+        journal: Journal | None = None,
     ) -> None:
         self.log = logger
+        self.cache = cache
+        self.journal = journal
 
+        self.timeout = (connect_timeout, read_timeout)
+        # Maximum duration of a batch (schedule_many...), in seconds.
+        self.deadline = deadline
+
+        self.limiter = limiter if limiter is not None else RateLimiter()
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        # self.workouts is shared between threads: always hold self._lock when
+        # touching it. Saves of a given name are serialized by their own lock
+        # so that concurrent schedules upload a workout only once.
+        self._lock = threading.Lock()
+        self._saving: dict[str, threading.RLock] = {}
         self.workouts: dict[str, list[int]] = defaultdict(list)
-        self.serializer = GarminSerializer()
+        self.digests: dict[str, str] = {}
+        # A serializer can be shared between clients to reuse its payloads.
+        self.serializer = serializer if serializer is not None else GarminSerializer()
 
         self.session = requests.Session()
+        # Block when all pool_size connections are busy rather than opening
+        # extra connections that would be thrown away after a single request.
+        self.adapter = HTTPAdapter(pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("https://", self.adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
         self.session.headers["Authorization"] = token.strip()
         self.session.headers["Content-Type"] = "application/json;charset=utf-8"
         self.session.headers["DI-Backend"] = "connectapi.garmin.com"
@@ -237,6 +685,120 @@ class GarminConnect:
             cookies = dict(c.split("=") for c in cookies.strip().split("; "))
         self.session.cookies.update(cookies)
 
+    def _request(
+        self, method: str, url: str, idempotent: bool, **kwargs: t.Any
+    ) -> requests.Response:
+        for attempt in itertools.count():
+            self.limiter.acquire()
+            # Exponential backoff with full jitter.
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+            try:
+                timeout = self._timeout()
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # A connect timeout guarantees the request was never sent.
+                retriable = idempotent or isinstance(e, requests.ConnectTimeout)
+                if not retriable or attempt >= self.retries:
+                    raise
+                self.log.warning("%s %s failed: %r, retrying.", method, url, e)
+                self._sleep(delay)
+                continue
+
+            status = response.status_code
+            retriable = status in self.RETRY_STATUSES and (
+                idempotent or status in self.REJECTED_STATUSES
+            )
+            if not retriable or attempt >= self.retries:
+                if status not in self.RETRY_STATUSES:
+                    self.limiter.succeed()
+                return response
+
+            wait = retry_after(response)
+            if status == 429:
+                self.limiter.throttle(delay if wait is None else wait)
+            self.log.warning(
+                "%s %s: %d %s, retrying.", method, url, status, response.reason
+            )
+            response.close()
+            self._sleep(delay if wait is None else wait)
+
+        raise AssertionError("unreachable")
+
+    def _timeout(self) -> tuple[float, float]:
+        deadline = DEADLINE.get()
+        if deadline is None:
+            return self.timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Batch deadline exceeded.")
+        connect, read = self.timeout
+        return min(connect, remaining), min(read, remaining)
+
+    def _sleep(self, seconds: float) -> None:
+        deadline = DEADLINE.get()
+        if deadline is not None and time.monotonic() + seconds > deadline:
+            raise TimeoutError("Batch deadline exceeded.")
+        time.sleep(seconds)
+
+    @contextlib.contextmanager
+    def batch(self) -> t.Iterator[None]:
+        # Bound all the requests of the batch by self.deadline, and report the
+        # connection reuse of the batch.
+        before = self.connection_stats()
+        deadline = DEADLINE.get()
+        if self.deadline is not None:
+            end = time.monotonic() + self.deadline
+            deadline = end if deadline is None else min(deadline, end)
+        token = DEADLINE.set(deadline)
+        try:
+            yield
+        finally:
+            DEADLINE.reset(token)
+            # Keep the journal to the size of what is still pending.
+            if self.journal is not None:
+                self.journal.compact()
+            after = self.connection_stats()
+            stats = ConnectionStats(
+                after.requests - before.requests,
+                after.connections - before.connections,
+            )
+            self.log.info(
+                "%d requests over %d connections (%.0f%% reuse).",
+                stats.requests,
+                stats.connections,
+                stats.reuse * 100,
+            )
+
+    @contextlib.contextmanager
+    def _journaled(
+        self, op: str, name: str, arg: str | int | None = None
+    ) -> t.Iterator[None]:
+        if self.journal is None:
+            yield
+            return
+        entry = Entry(op, name, arg)
+        self.journal.plan(entry)
+        yield
+        self.journal.done(entry)
+
+    def journal_batch(self, days: list[tuple[date, Workout]]) -> None:
+        # Journal a whole batch upfront, so that a resume also covers the days
+        # that were never reached. The schedules themselves do not plan their
+        # entry again.
+        if self.journal is not None:
+            for d, workout in days:
+                self.journal.plan(Entry("schedule", workout.name, d.isoformat()))
+
+    def connection_stats(self) -> ConnectionStats:
+        sent = opened = 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                sent += pool.num_requests
+                opened += pool.num_connections
+        return ConnectionStats(sent, opened)
+
     def login(self) -> None:
         # Does not work
         # TODO: retrieve cookies automatically
@@ -244,77 +806,566 @@ class GarminConnect:
         response = self.session.get("https://connect.garmin.com/modern/")
         self.log.debug("Response: %r", response)
 
-    def load(self) -> None:
+    def load(
+        self, page_size: int = 100, max_workers: int = 1, resync: bool = False
+    ) -> None:
+        if self.cache is not None and not resync and not self.cache.stale():
+            self.log.info("Load workouts from cache.")
+            with self._lock:
+                self.workouts.clear()
+                self.workouts.update(self.cache.workouts())
+                self.digests = self.cache.digests()
+            return
+
         self.log.info("Load all workouts.")
 
+        with self._lock:
+            self.workouts.clear()
+            self.digests.clear()
+        for page in self._pages(page_size, max_workers):
+            with self._lock:
+                for workout in page:
+                    self.workouts[workout["workoutName"]].append(workout["workoutId"])
+        with self._lock:
+            # Ids grow with every upload: the last one of a name is current.
+            for workoutIds in self.workouts.values():
+                workoutIds.sort()
+
+        if self.cache is not None:
+            with self._lock:
+                self.cache.replace(self.workouts)
+                self.digests = self.cache.digests()
+
+    def _pages(self, page_size: int, max_workers: int) -> t.Iterator[list[dict]]:
+        # Pages are fetched max_workers at a time and yielded in order, until
+        # the first page that is not full.
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for first in itertools.count(1, page_size * max_workers):
+                starts = range(first, first + page_size * max_workers, page_size)
+                futures = [submit(pool, self._page, s, page_size) for s in starts]
+                for future in futures:
+                    page = future.result()
+                    yield page
+                    if len(page) < page_size:
+                        return
+
+    def _page(self, start: int, limit: int) -> list[dict]:
+        self.log.debug("Load workouts %d to %d.", start, start + limit - 1)
+
         url = f"{self.BASE_URL}/workout-service/workouts"
         params = {
-            "start": 1,
-            "limit": 999,
+            "start": start,
+            "limit": limit,
             "myWorkoutsOnly": True,
             "includeAtp": False,
         }
-        response = self.session.get(url, params=params)
-        for workout in response.json():
-            self.workouts[workout["workoutName"]].append(workout["workoutId"])
+        with self._request(
+            "GET", url, idempotent=True, params=params, stream=True
+        ) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            return json.load(response.raw)
+
+    def names(self) -> list[str]:
+        with self._lock:
+            return list(self.workouts.keys())
+
+    def ids(self, name: str) -> list[int]:
+        with self._lock:
+            return list(self.workouts.get(name, []))
 
     def delete(self, workout: Workout | str) -> None:
         name = workout.name if isinstance(workout, Workout) else workout
 
-        for workoutId in self.workouts.get(name, []):
-            self.log.info("Delete '%s' (id: %d)", name, workoutId)
+        for workoutId in self.ids(name):
+            self._delete(name, workoutId)
 
-            url = f"{self.BASE_URL}/workout-service/workout/{workoutId}"
-            headers = {"X-HTTP-Method-Override": "DELETE"}
-            self.session.post(url, headers=headers)
+    def _delete(self, name: str, workoutId: int) -> None:
+        self.log.info("Delete '%s' (id: %d)", name, workoutId)
+
+        url = f"{self.BASE_URL}/workout-service/workout/{workoutId}"
+        headers = {"X-HTTP-Method-Override": "DELETE"}
+        with self._journaled("delete", name, workoutId):
+            response = self._request("POST", url, idempotent=True, headers=headers)
+            # Already deleted is as good as deleted.
+            if response.status_code != 404:
+                response.raise_for_status()
+        self._forget(name, workoutId)
 
     def delete_all(self) -> None:
         self.log.info("Delete all workouts.")
-        for name in self.workouts.keys():
+        for name in self.names():
             self.delete(name)
 
+    def gc(
+        self,
+        keep: t.Iterable[Workout | str],
+        dry_run=True,
+        max_workers: int = 8,
+        superseded=False,
+    ) -> dict[str, list[int]]:
+        """Delete the uploaded workouts that are not in `keep`.
+
+        With `superseded`, also delete the outdated uploads of the workouts of
+        `keep` that changed: the days still scheduled with them are lost.
+        Returns the garbage, which is only reported when `dry_run` is set.
+        """
+        marked = {w.name if isinstance(w, Workout) else w for w in keep}
+        with self._lock:
+            garbage = {
+                name: list(workoutIds) if name not in marked else workoutIds[:-1]
+                for name, workoutIds in self.workouts.items()
+                if name not in marked or (superseded and len(workoutIds) > 1)
+            }
+
+        self.log.info(
+            "%d unreferenced workouts (%d uploads).",
+            len(garbage),
+            sum(map(len, garbage.values())),
+        )
+        for name, workoutIds in garbage.items():
+            self.log.info("Unreferenced: '%s' (ids: %s)", name, workoutIds)
+        if dry_run:
+            return garbage
+
+        with self.batch(), ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                (name, workoutId): submit(pool, self._delete, name, workoutId)
+                for name, workoutIds in garbage.items()
+                for workoutId in workoutIds
+            }
+            for (name, workoutId), future in futures.items():
+                if future.exception() is not None:
+                    self.log.error(
+                        "Failed to delete '%s' (id: %d): %r",
+                        name,
+                        workoutId,
+                        future.exception(),
+                    )
+        return garbage
+
+    def _forget(self, name: str, workoutId: int) -> None:
+        with self._lock:
+            if workoutId in self.workouts.get(name, []):
+                self.workouts[name].remove(workoutId)
+            if not self.workouts.get(name, True):
+                del self.workouts[name]
+                self.digests.pop(name, None)
+        if self.cache is not None:
+            self.cache.remove(workoutId)
+
+    def _save_lock(self, name: str) -> threading.RLock:
+        with self._lock:
+            return self._saving.setdefault(name, threading.RLock())
+
+    def uploaded(self, workout: Workout) -> int | None:
+        """Id of the up-to-date upload of `workout`, None if it must be saved."""
+        workoutIds = self.ids(workout.name)
+        with self._lock:
+            digest = self.digests.get(workout.name)
+        # Without a known digest, trust the name as we always did.
+        if workoutIds and (digest is None or digest == workout.payload_key()):
+            return workoutIds[-1]
+        return None
+
     def save(self, workout: Workout, force=False) -> None:
-        if not force and workout.name in self.workouts:
-            self.log.debug(
-                "Workout %r (id: %s) already exists.",
-                workout.name,
-                self.workouts[workout.name],
-            )
-            return
+        with self._save_lock(workout.name):
+            workoutIds = self.ids(workout.name)
+            if not force and workoutIds:
+                if self.uploaded(workout) is not None:
+                    self.log.debug(
+                        "Workout %r (id: %s) already exists.", workout.name, workoutIds
+                    )
+                    return
+                # The outdated uploads are kept: the days scheduled with them
+                # still point to them. gc() collects them.
+                self.log.info("Workout %r has changed.", workout.name)
 
-        self.log.info("Save '%s'", workout.name)
-        url = f"{self.BASE_URL}/workout-service/workout"
-        data = self.serializer.serialize(workout)
-        response = self.session.post(url, data=data)
-        if response.status_code != 200:
-            self.log.error(
-                "Received code: %d %s", response.status_code, response.reason
-            )
-            return
-        workoutId = response.json()["workoutId"]
-        self.log.debug("Saved workout %r (id: %d)", workout.name, workoutId)
-        self.workouts[workout.name].append(workoutId)
+            with self._journaled("save", workout.name):
+                self.log.info("Save '%s'", workout.name)
+                url = f"{self.BASE_URL}/workout-service/workout"
+                data = self.serializer.encode(workout)
+                response = self._request("POST", url, idempotent=False, data=data)
+                if response.status_code != 200:
+                    self.log.error(
+                        "Received code: %d %s", response.status_code, response.reason
+                    )
+                    response.raise_for_status()
+                workoutId = response.json()["workoutId"]
+                digest = workout.payload_key()
+                self.log.debug("Saved workout %r (id: %d)", workout.name, workoutId)
+                # The last upload of a name is the current one.
+                with self._lock:
+                    self.workouts[workout.name].append(workoutId)
+                    self.digests[workout.name] = digest
+                if self.cache is not None:
+                    self.cache.add(workout.name, workoutId, digest)
 
     def schedule(self, workout: Workout, d: date, save=True) -> None:
         self.log.info("Schedule '%s' on %s", workout.name, d.isoformat())
-        if save:
-            self.save(workout, force=False)
+        with self._journaled("schedule", workout.name, d.isoformat()):
+            if save:
+                self.save(workout, force=False)
+
+            workoutId, response = self._schedule(workout, d)
+            if response.status_code == 404 and save:
+                self._reupload(workout, workoutId)
+                _, response = self._schedule(workout, d)
+            response.raise_for_status()
+
+    def _reupload(self, workout: Workout, workoutId: int) -> None:
+        # The id is gone remotely: upload the workout again, unless another
+        # thread already replaced it meanwhile.
+        with self._save_lock(workout.name):
+            workoutIds = self.ids(workout.name)
+            if workoutIds and workoutIds[-1] != workoutId:
+                return
+            self.log.warning(
+                "Workout %r (id: %d) no longer exists.", workout.name, workoutId
+            )
+            self._forget(workout.name, workoutId)
+            self.save(workout, force=True)
 
-        assert workout.name in self.workouts
-        workoutId = self.workouts[workout.name][0]
+    def _schedule(self, workout: Workout, d: date) -> tuple[int, requests.Response]:
+        workoutIds = self.ids(workout.name)
+        if not workoutIds:
+            raise LookupError(f"Workout {workout.name!r} is not saved.")
+        workoutId = workoutIds[-1]
 
         url = f"{self.BASE_URL}/workout-service/schedule/{workoutId}"
         data = {"date": d.isoformat()}
-        self.session.post(url, json=data)
+        return workoutId, self._request("POST", url, idempotent=False, json=data)
+
+    def scheduled(self, start: date, end: date) -> dict[date, list[Scheduled]]:
+        self.log.info("Load the calendar from %s to %s.", start, end)
+
+        months = sorted({(d.year, d.month) for d in date_range(start, end)})
+        if not months:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(months)) as pool:
+            futures = [submit(pool, self._calendar, *month) for month in months]
+            items = [item for future in futures for item in future.result()]
+
+        calendar: dict[date, list[Scheduled]] = defaultdict(list)
+        for item in items:
+            d = date.fromisoformat(item["date"])
+            if item.get("itemType") == "workout" and start <= d <= end:
+                calendar[d].append(
+                    Scheduled(item["id"], item["workoutId"], item["title"], d)
+                )
+        return calendar
+
+    def _calendar(self, year: int, month: int) -> list[dict]:
+        # Months of the calendar service are numbered from 0.
+        url = f"{self.BASE_URL}/calendar-service/year/{year}/month/{month - 1}"
+        response = self._request("GET", url, idempotent=True)
+        response.raise_for_status()
+        return response.json().get("calendarItems", [])
+
+    def unschedule(self, scheduled: Scheduled) -> None:
+        self.log.info(
+            "Unschedule '%s' on %s", scheduled.name, scheduled.date.isoformat()
+        )
+
+        url = f"{self.BASE_URL}/workout-service/schedule/{scheduled.scheduleId}"
+        headers = {"X-HTTP-Method-Override": "DELETE"}
+        response = self._request("POST", url, idempotent=True, headers=headers)
+        if response.status_code != 404:
+            response.raise_for_status()
+
+    def sync(
+        self,
+        workouts: t.Iterable[Workout | None],
+        start_date: date,
+        max_workers: int = 8,
+        dry_run: bool = False,
+    ) -> ScheduleDiff:
+        workouts = list(workouts)
+        end_date = start_date + timedelta(days=len(workouts) - 1)
+
+        with self.batch():
+            # Upload the changed workouts first, so that the days still
+            # scheduled with an outdated upload are replaced.
+            unique = self.unique(workouts)
+            errors = {} if dry_run else self.save_many(unique, max_workers)
+            current = {
+                workout.name: self.uploaded(workout)
+                for workout in unique
+                if errors.get(workout.name) is None
+            }
+            remote = self.scheduled(start_date, end_date)
+            diff = diff_schedule(workouts, start_date, remote, current)
+            self.log.info(
+                "Sync: %d to add, %d to remove, %d to replace.",
+                len(diff.add),
+                len(diff.remove),
+                len(diff.replace),
+            )
+            if dry_run or not diff:
+                return diff
+
+            removed = diff.remove + [old for old, _ in diff.replace]
+            added = diff.add + [(old.date, new) for old, new in diff.replace]
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                removals = [submit(pool, self.unschedule, old) for old in removed]
+                additions = [
+                    submit(pool, self.schedule, workout, d=d) for d, workout in added
+                ]
+                for old, future in zip(removed, removals):
+                    if future.exception() is not None:
+                        self.log.error(
+                            "Failed to unschedule '%s' on %s: %r",
+                            old.name,
+                            old.date.isoformat(),
+                            future.exception(),
+                        )
+                self.report(added, [future.exception() for future in additions])
+
+        return diff
 
     def schedule_many(
         self, workouts: t.Iterable[Workout | None], start_date: date, save=True
     ) -> None:
-        for i, workout in enumerate(workouts):
-            if workout is not None:
-                d = start_date + timedelta(days=i)
+        days = plan_days(workouts, start_date)
+        self.journal_batch(days)
+        with self.batch():
+            for d, workout in days:
                 self.schedule(workout, d=d, save=save)
 
+    def schedule_many_parallel(
+        self,
+        workouts: t.Iterable[Workout | None],
+        start_date: date,
+        save=True,
+        max_workers: int = 8,
+    ) -> list[ScheduleResult]:
+        return self.schedule_plans(
+            [(workouts, start_date)], save=save, max_workers=max_workers
+        )
+
+    def schedule_plans(
+        self,
+        plans: t.Iterable[tuple[t.Iterable[Workout | None], date]],
+        save=True,
+        max_workers: int = 8,
+    ) -> list[ScheduleResult]:
+        """Schedule several (workouts, start_date) plans as a single batch.
+
+        The unique workouts of all the plans are uploaded first, concurrently,
+        then every day is scheduled concurrently: no schedule waits on a save.
+        """
+        days = [
+            day
+            for workouts, start_date in plans
+            for day in plan_days(workouts, start_date)
+        ]
+        self.journal_batch(days)
+
+        with self.batch():
+            failed: dict[str, BaseException | None] = {}
+            if save:
+                failed = self.save_many((w for _, w in days), max_workers)
+
+            # Workouts are saved by now: save() is only a local lookup.
+            errors: list[BaseException | None] = []
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures: list[Future[None] | None] = []
+                for d, workout in days:
+                    if failed.get(workout.name) is None:
+                        futures.append(
+                            submit(pool, self.schedule, workout, d=d, save=save)
+                        )
+                    else:
+                        futures.append(None)
+                for (_, workout), future in zip(days, futures):
+                    if future is None:
+                        errors.append(failed[workout.name])
+                    else:
+                        errors.append(future.exception())
+        return self.report(days, errors)
+
+    def unique(self, workouts: t.Iterable[Workout | None]) -> list[Workout]:
+        unique: dict[str, Workout] = {}
+        for workout in workouts:
+            if workout is None:
+                continue
+            first = unique.setdefault(workout.name, workout)
+            if first.payload_key() != workout.payload_key():
+                self.log.warning(
+                    "Different workouts are named %r: keep the first one.",
+                    workout.name,
+                )
+        return list(unique.values())
+
+    def save_many(
+        self, workouts: t.Iterable[Workout | None], max_workers: int = 8
+    ) -> dict[str, BaseException | None]:
+        unique = self.unique(workouts)
+        self.log.info("Save %d unique workouts.", len(unique))
+        with self.batch(), ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                workout.name: submit(pool, self.save, workout) for workout in unique
+            }
+            errors = {name: future.exception() for name, future in futures.items()}
+        for name, error in errors.items():
+            if error is not None:
+                self.log.error("Failed to save '%s': %r", name, error)
+        return errors
+
+    def resume(
+        self, workouts: t.Iterable[Workout], max_workers: int = 8
+    ) -> list[Entry]:
+        """Replay the operations of the journal that never completed.
+
+        An operation may have reached the service right before the crash:
+        saves and schedules that are found to exist remotely are only marked
+        as done. Returns the entries that are still pending.
+        """
+        assert self.journal is not None
+        catalog = {workout.name: workout for workout in workouts}
+        pending = self.journal.pending()
+        self.log.info("Resume %d pending operations.", len(pending))
+
+        if any(e.op == "save" for e in pending):
+            # The local index knows nothing of the uploads that reached the
+            # service right before the crash.
+            self.load(resync=True)
+
+        schedules = [e for e in pending if e.op == "schedule"]
+        calendar: dict[date, list[Scheduled]] = {}
+        if schedules:
+            dates = [date.fromisoformat(e.arg) for e in schedules]
+            calendar = self.scheduled(min(dates), max(dates))
+
+        def replay(entry: Entry) -> None:
+            if entry.op == "delete":
+                self._delete(entry.name, entry.arg)
+                return
+
+            workout = catalog.get(entry.name)
+            if workout is None:
+                raise LookupError(f"Unknown workout {entry.name!r}")
+            if entry.op == "save":
+                # save() itself skips workouts that are already uploaded, now
+                # that the index is reloaded from the service.
+                self.save(workout)
+                self.journal.done(entry)
+            elif entry.op == "schedule":
+                d = date.fromisoformat(entry.arg)
+                if any(s.name == entry.name for s in calendar.get(d, [])):
+                    self.journal.done(entry)
+                else:
+                    self.schedule(workout, d=d)
+
+        with self.batch(), ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [submit(pool, replay, entry) for entry in pending]
+            for entry, future in zip(pending, futures):
+                if future.exception() is not None:
+                    self.log.error("Failed to replay %s: %r", entry, future.exception())
+
+        return self.journal.pending()
+
+    def report(
+        self,
+        days: list[tuple[date, Workout]],
+        errors: t.Iterable[BaseException | None],
+    ) -> list[ScheduleResult]:
+        results = []
+        for (d, workout), error in zip(days, errors):
+            if error is not None:
+                self.log.error(
+                    "Failed to schedule '%s' on %s: %r",
+                    workout.name,
+                    d.isoformat(),
+                    error,
+                )
+            results.append(ScheduleResult(d, workout, error))
+        return results
+
+
+class AsyncGarminConnect:
+    """Asyncio front-end to a GarminConnect client.
+
+    Blocking requests are offloaded to worker threads, at most `concurrency`
+    at a time, so that the uploads of a whole plan overlap.
+    """
+
+    def __init__(self, client: GarminConnect, concurrency: int = 8) -> None:
+        self.client = client
+        self.log = client.log
+
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._saving: dict[str, asyncio.Future[None]] = {}
+
+    async def _run[**P, R](
+        self, func: t.Callable[P, R], *args: P.args, **kwargs: P.kwargs
+    ) -> R:
+        async with self._semaphore:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def load(self) -> None:
+        await self._run(self.client.load)
+
+    async def delete(self, workout: Workout | str) -> None:
+        await self._run(self.client.delete, workout)
+
+    async def delete_all(self) -> None:
+        self.log.info("Delete all workouts.")
+        names = self.client.names()
+        await asyncio.gather(*(self.delete(name) for name in names))
+
+    async def save(self, workout: Workout, force=False) -> None:
+        if force:
+            await self._run(self.client.save, workout, force=True)
+            return
+
+        # Several days of a plan share the same workout: upload it only once
+        # and let every schedule wait for that single upload.
+        future = self._saving.get(workout.name)
+        if future is None:
+            future = asyncio.ensure_future(self._run(self.client.save, workout))
+            self._saving[workout.name] = future
+        try:
+            await asyncio.shield(future)
+        except BaseException:
+            if self._saving.get(workout.name) is future and future.done():
+                del self._saving[workout.name]
+            raise
+
+    async def schedule(self, workout: Workout, d: date, save=True) -> None:
+        if save:
+            await self.save(workout)
+        # The workout is saved by now: the client only looks it up, and
+        # uploads it again if it is gone remotely.
+        await self._run(self.client.schedule, workout, d=d, save=save)
+
+    async def schedule_many(
+        self, workouts: t.Iterable[Workout | None], start_date: date, save=True
+    ) -> list[ScheduleResult]:
+        days = plan_days(workouts, start_date)
+        self.client.journal_batch(days)
+        with self.client.batch():
+            # Upload the unique workouts first, then fire every schedule.
+            failed: dict[str, BaseException | None] = {}
+            if save:
+                unique = self.client.unique(workout for _, workout in days)
+                errors = await asyncio.gather(
+                    *(self.save(workout) for workout in unique),
+                    return_exceptions=True,
+                )
+                failed = {w.name: error for w, error in zip(unique, errors)}
+
+            async def schedule(workout: Workout, d: date) -> None:
+                if failed.get(workout.name) is not None:
+                    raise failed[workout.name]
+                await self.schedule(workout, d=d, save=save)
+
+            errors = await asyncio.gather(
+                *(schedule(workout, d) for d, workout in days),
+                return_exceptions=True,
+            )
+        return self.client.report(days, errors)
+
 
 if __name__ == "__main__":
     log_level = os.getenv("LOG_LEVEL", "WARNING").upper()
@@ -322,6 +1373,10 @@ if __name__ == "__main__":
 
     import argparse
 
+    from plans import half_marathon
+    from plans import marathon
+    from plans import referenced
+
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "-t",
@@ -339,15 +1394,126 @@ if __name__ == "__main__":
         type=argparse.FileType("r"),
         help="File containing valid cookies.",
     )
+    parser.add_argument(
+        "--lt",
+        default=LT,
+        metavar="BPM",
+        type=int,
+        help=(
+            f"Lactate threshold heart rate (default: {LT}). Only local: the"
+            " uploaded zones are numbered, Garmin applies the athlete's own."
+        ),
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="FILE",
+        help="SQLite file caching the remote workouts between runs.",
+    )
+    parser.add_argument(
+        "--account",
+        default="default",
+        help="Account name used as the cache key (default: default).",
+    )
+    parser.add_argument(
+        "--resync",
+        action="store_true",
+        help="Ignore the cache and reload all workouts.",
+    )
+    parser.add_argument(
+        "--gc",
+        action="store_true",
+        help="Report the uploaded workouts that no plan references.",
+    )
+    parser.add_argument(
+        "--gc-apply",
+        action="store_true",
+        help="Delete the uploaded workouts that no plan references.",
+    )
+    parser.add_argument(
+        "--superseded",
+        action="store_true",
+        help="With --gc or --gc-apply, also collect the outdated uploads of"
+        " changed workouts.",
+    )
+    parser.add_argument(
+        "--journal",
+        metavar="FILE",
+        help="Log every operation to FILE, to be able to resume the run.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Only replay the operations of the journal that did not complete.",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Only add, remove or replace what differs from the calendar.",
+    )
+    parser.add_argument(
+        "-j",
+        "--concurrency",
+        default=1,
+        metavar="N",
+        type=int,
+        help="Number of concurrent requests (default: 1).",
+    )
+    parser.add_argument(
+        "-r",
+        "--rate",
+        default=10.0,
+        metavar="N",
+        type=float,
+        help="Maximum requests per second, lowered whenever the service"
+        " throttles (default: 10).",
+    )
 
     args = parser.parse_args()
     token = args.token.read()
     cookies = args.cookies.read()
 
-    garmin = GarminConnect(token=token, cookies=cookies)
+    cache = WorkoutCache(args.cache, account=args.account) if args.cache else None
+    journal = Journal(args.journal) if args.journal else None
+    if args.resume and journal is None:
+        parser.error("--resume requires --journal")
+    garmin = GarminConnect(
+        token=token,
+        cookies=cookies,
+        cache=cache,
+        pool_size=max(10, args.concurrency),
+        journal=journal,
+        limiter=RateLimiter(rate=args.rate),
+    )
     # garmin.login()
-    garmin.load()
+    garmin.load(resync=args.resync)
+
+    if args.gc or args.gc_apply:
+        garbage = garmin.gc(
+            referenced(marathon, half_marathon),
+            dry_run=not args.gc_apply,
+            max_workers=args.concurrency,
+            superseded=args.superseded,
+        )
+        for name, workoutIds in sorted(garbage.items()):
+            print(f"{name}: {', '.join(map(str, workoutIds))}")
+        raise SystemExit
 
     ###  EDIT HERE  ###
     workouts = itertools.chain.from_iterable(marathon[1][i] for i in range(1, 5))
-    garmin.schedule_many(workouts, start_date=date(2024, 12, 9))
+    start_date = date(2024, 12, 9)
+
+    workouts = (None if w is None else w.at(args.lt) for w in workouts)
+
+    if args.resume:
+        garmin.resume(
+            (workout for workout in workouts if workout is not None),
+            max_workers=args.concurrency,
+        )
+    elif args.sync:
+        garmin.sync(workouts, start_date=start_date, max_workers=args.concurrency)
+    elif args.concurrency > 1:
+        garmin.schedule_many_parallel(
+            workouts, start_date=start_date, max_workers=args.concurrency
+        )
+    else:
+        garmin.schedule_many(workouts, start_date=start_date)
@@ -0,0 +1,275 @@
+import bisect
+import math
+import typing as t
+from collections.abc import Collection
+from collections.abc import Mapping
+from datetime import date
+
+from estimate import DEFAULT_PROFILE
+from estimate import PaceProfile
+from estimate import estimate
+from plans import Plan
+from workouts import Workout
+from workouts import foundation_run
+from workouts import hill_repetition_run
+from workouts import long_interval_run
+from workouts import long_run
+from workouts import recovery_run
+from workouts import speed_play_run
+from workouts import tempo_run
+
+QUALITY = (tempo_run, speed_play_run, hill_repetition_run, long_interval_run)
+"Families of the weekly quality workout, in turn."
+
+LEVELS = 10
+"Progression levels of the quality workouts, spread over every family."
+
+EASIER = 3
+"Steps back the progressions may take during recovery weeks."
+
+
+class Rules(t.NamedTuple):
+    """Target weekly volume of a plan, in minutes."""
+
+    minutes: float = 180.0
+    "Volume of the first week."
+    growth: float = 0.08
+    "Increase from one week to the next."
+    peak: float = 420.0
+    "Highest volume."
+    recovery_every: int = 4
+    "Every n-th week is a recovery week..."
+    recovery: float = 0.7
+    "... at this share of the volume of the week before."
+    taper: tuple[float, ...] = (0.75, 0.5)
+    "Shares of the peak volume of the last weeks."
+
+
+def targets(weeks: int, rules: Rules = Rules()) -> list[float]:
+    curve: list[float] = []
+    load = rules.minutes
+    for week in range(1, weeks + 1):
+        left = weeks - week
+        if left < len(rules.taper):
+            curve.append(max(curve, default=load) * rules.taper[-1 - left])
+            continue
+        if week > 1 and week % rules.recovery_every != 0:
+            load = min(load * (1 + rules.growth), rules.peak)
+        if week % rules.recovery_every == 0:
+            curve.append(load * rules.recovery)
+        else:
+            curve.append(load)
+    return curve
+
+
+class State(t.NamedTuple):
+    long: int
+    "Number of the last long run."
+    quality: int
+    "Level of the last quality workout."
+
+
+class Choice(t.NamedTuple):
+    cost: float
+    previous: State | None
+    days: list[Workout | None]
+
+
+def generate(
+    start: date,
+    race: date,
+    days: Collection[int] = (1, 3, 5, 6),
+    long_day: int | None = None,
+    rules: Rules = Rules(),
+    level: int = 1,
+    beam: int = 16,
+    profile: PaceProfile = DEFAULT_PROFILE,
+) -> Plan:
+    """Plan from `start` to the week of `race`, following the volume of `rules`.
+
+    `days` are the days of the week available for running, counted from the
+    weekday of `start`, and the long run is on `long_day`, by default the last
+    of them. Every week has a long run, a quality workout on the available
+    day furthest from it and easy runs on the other days, except the race
+    week, which only has recovery runs before the race.
+
+    The long runs and quality workouts may only progress by one step a week,
+    and take up to EASIER steps back during recovery weeks, after which they
+    resume where they were. The weeks are searched by dynamic
+    programming over these progressions, keeping the `beam` best, for the
+    plan whose volume is the closest to the targets.
+    """
+    if race < start:
+        raise ValueError("The race is before the start of the plan")
+    weeks = (race - start).days // 7 + 1
+    days = sorted(set(days))
+    if not days:
+        raise ValueError("No day is available")
+    if not 0 <= days[0] <= days[-1] <= 6:
+        raise ValueError(f"Available days {days} are not all between 0 and 6")
+    long_day = days[-1] if long_day is None else long_day
+    if long_day not in days:
+        raise ValueError(f"Long run day {long_day} is not an available day")
+    others = [d for d in days if d != long_day]
+    quality_day = (
+        max(others, key=lambda d: min((d - long_day) % 7, (long_day - d) % 7))
+        if others
+        else None
+    )
+    easy_days = [d for d in others if d != quality_day]
+
+    def table(catalog: Mapping[int, Workout]) -> tuple[list[float], list[Workout]]:
+        # Minutes and workouts of `catalog`, by duration.
+        ranked = sorted(
+            (estimate(w, profile).seconds / 60, n) for n, w in catalog.items()
+        )
+        return [m for m, _ in ranked], [catalog[n] for _, n in ranked]
+
+    def easy(
+        total: float, count: int, table: tuple[list[float], list[Workout]]
+    ) -> tuple[float, list[Workout]]:
+        # Spread `total` minutes over `count` runs, as evenly as the catalog
+        # allows.
+        durations, workouts = table
+        volume = 0.0
+        picked = []
+        for left in range(count, 0, -1):
+            goal = (total - volume) / left
+            i = bisect.bisect_left(durations, goal)
+            if i == len(durations) or (
+                i > 0 and goal - durations[i - 1] <= durations[i] - goal
+            ):
+                i -= 1
+            volume += durations[i]
+            picked.append(workouts[i])
+        return volume, picked
+
+    minutes = {
+        w: estimate(w, profile).seconds / 60
+        for catalog in (long_run, *QUALITY)
+        for w in catalog.values()
+    }
+    foundation = table(foundation_run)
+
+    def week_days(
+        long: Workout, quality: Workout | None, target: float
+    ) -> tuple[float, list[Workout | None]]:
+        week: list[Workout | None] = [None] * 7
+        week[long_day] = long
+        volume = minutes[long]
+        if quality is not None:
+            week[quality_day] = quality
+            volume += minutes[quality]
+        filler, runs = easy(target - volume, len(easy_days), foundation)
+        for d, workout in zip(easy_days, runs):
+            week[d] = workout
+        return volume + filler, week
+
+    curve = targets(weeks, rules)
+    choices: list[dict[State, Choice]] = []
+    frontier: dict[State | None, float] = {None: 0.0}
+    for week in range(1, weeks):
+        target = curve[week - 1]
+        easier = week % rules.recovery_every == 0 or weeks - week < len(rules.taper)
+        family = QUALITY[(week - 1) % len(QUALITY)]
+        options: dict[State, Choice] = {}
+        # Cost and days of a (long run, quality level) week, whatever the
+        # week before.
+        scored: dict[tuple[int, int], tuple[float, list[Workout | None]]] = {}
+        for state, total in frontier.items():
+            if state is None:
+                longs, levels = range(1, len(long_run) + 1), range(1, LEVELS + 1)
+            elif easier:
+                longs = range(max(1, state.long - EASIER), state.long + 1)
+                levels = range(max(1, state.quality - EASIER), state.quality + 1)
+            else:
+                longs = range(state.long, min(state.long + 1, len(long_run)) + 1)
+                levels = range(state.quality, min(state.quality + 1, LEVELS) + 1)
+            for n in longs:
+                for q in levels:
+                    if (n, q) not in scored:
+                        quality = (
+                            family[math.ceil(q * len(family) / LEVELS)]
+                            if quality_day is not None
+                            else None
+                        )
+                        volume, candidate = week_days(long_run[n], quality, target)
+                        scored[n, q] = ((volume - target) / target) ** 2, candidate
+                    cost, candidate = scored[n, q]
+                    choice = Choice(total + cost, state, candidate)
+                    # Easier weeks do not set the progression back.
+                    new = state if easier and state is not None else State(n, q)
+                    if new not in options or choice.cost < options[new].cost:
+                        options[new] = choice
+        best = sorted(options.items(), key=lambda item: item[1].cost)[:beam]
+        choices.append(dict(best))
+        frontier = {state: choice.cost for state, choice in best}
+
+    # Race week: a share of its volume in recovery runs before the race.
+    before = [d for d in days if d < (race - start).days % 7]
+    race_week: list[Workout | None] = [None] * 7
+    volume = curve[-1] * len(before) / len(days)
+    for d, workout in zip(before, easy(volume, len(before), table(recovery_run))[1]):
+        race_week[d] = workout
+
+    plan: dict[int, list[Workout | None]] = {weeks: race_week}
+    state = min(frontier, key=frontier.__getitem__)
+    for week in range(weeks - 1, 0, -1):
+        choice = choices[week - 1][state]
+        plan[week] = choice.days
+        state = choice.previous
+    return {level: dict(sorted(plan.items()))}
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("start", type=date.fromisoformat, help="First day of the plan.")
+    parser.add_argument("race", type=date.fromisoformat, help="Day of the race.")
+    parser.add_argument(
+        "--days",
+        default="1,3,5,6",
+        help="Available days, counted from the start weekday (default: 1,3,5,6).",
+    )
+    parser.add_argument(
+        "--long-day",
+        type=int,
+        help="Day of the long run (default: the last available day).",
+    )
+    parser.add_argument(
+        "--minutes",
+        default=Rules().minutes,
+        type=float,
+        help=f"Volume of the first week (default: {Rules().minutes:.0f}).",
+    )
+    parser.add_argument(
+        "--peak",
+        default=Rules().peak,
+        type=float,
+        help=f"Highest weekly volume (default: {Rules().peak:.0f}).",
+    )
+    args = parser.parse_args()
+
+    rules = Rules(minutes=args.minutes, peak=args.peak)
+    begin = time.perf_counter()
+    try:
+        plan = generate(
+            args.start,
+            args.race,
+            days=[int(d) for d in args.days.split(",")],
+            long_day=args.long_day,
+            rules=rules,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - begin
+
+    weeks = plan[1]
+    for (week, days), target in zip(weeks.items(), targets(len(weeks), rules)):
+        volume = sum(estimate(w).seconds / 60 for w in days if w is not None)
+        print(f"Week {week}: {volume:.0f} min (target {target:.0f})")
+        for workout in days:
+            print(f"  {workout.name if workout is not None else '-'}")
+    print(f"Generated in {elapsed * 1e3:.1f} ms")
@@ -0,0 +1,240 @@
+import bisect
+import math
+import typing as t
+from collections import defaultdict
+from collections.abc import Collection
+from collections.abc import Mapping
+
+from estimate import DEFAULT_PROFILE
+from estimate import PaceProfile
+from estimate import estimate_steps
+from workouts import Workout
+from workouts import runs
+
+ZONES = range(1, 6)
+
+type Range = tuple[float | None, float | None]
+"Inclusive bounds, None for no bound."
+
+
+class Indexed(t.NamedTuple):
+    family: str
+    number: int
+    workout: Workout
+    minutes: float
+    km: float
+    zones: dict[int, float]
+    "Minutes per HR zone number."
+    steps: frozenset[str]
+    "Class names of the steps, Repeat included."
+
+
+def describe(
+    family: str, number: int, workout: Workout, profile: PaceProfile
+) -> Indexed:
+    flat = workout.flat()
+    estimates = estimate_steps(workout, profile)
+    zones = dict.fromkeys(ZONES, 0.0)
+    times = [1] * len(flat)
+    for i in range(len(flat)):
+        parent = flat.parent[i]
+        if parent >= 0:
+            times[i] = times[parent] * flat.count[parent]
+        if flat.kind[i] != flat.REPEAT and flat.zone[i] in zones:
+            zones[flat.zone[i]] += estimates.seconds[i] * times[i] / 60
+    return Indexed(
+        family,
+        number,
+        workout,
+        estimates.total.seconds / 60,
+        estimates.total.km,
+        zones,
+        frozenset(flat.classes[kind].__name__ for kind in set(flat.kind)),
+    )
+
+
+class CatalogIndex:
+    """Searchable index of numbered workouts.
+
+    Families, numbers and step types map to the sets of entries having them,
+    durations, distances and minutes per zone are kept sorted: a query
+    intersects the entries of each of its filters.
+
+    ```python
+    index = CatalogIndex.from_catalogs(runs)
+    index.query(
+        family={"Cruise interval runs", "Short interval runs"},
+        minutes=(None, 50),
+        zones={3: (20, None)},
+    )
+    ```
+    """
+
+    def __init__(self, profile: PaceProfile = DEFAULT_PROFILE) -> None:
+        self.profile = profile
+        self.entries: list[Indexed | None] = []
+
+        self._ids: dict[tuple[str, int], int] = {}
+        self._sets: dict[str, defaultdict[t.Any, set[int]]] = {
+            "family": defaultdict(set),
+            "number": defaultdict(set),
+            "steps": defaultdict(set),
+        }
+        # Sorted (value, id) pairs.
+        self._sorted: dict[t.Any, list[tuple[float, int]]] = {
+            "minutes": [],
+            "km": [],
+            **{zone: [] for zone in ZONES},
+        }
+
+    @classmethod
+    def from_catalogs(
+        cls,
+        catalogs: Mapping[str, Mapping[int, Workout]],
+        profile: PaceProfile = DEFAULT_PROFILE,
+    ) -> "CatalogIndex":
+        index = cls(profile)
+        for family, catalog in catalogs.items():
+            index.add_catalog(family, catalog)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add_catalog(self, family: str, catalog: Mapping[int, Workout]) -> None:
+        for number, workout in catalog.items():
+            self.add(family, number, workout)
+
+    def add(self, family: str, number: int, workout: Workout) -> None:
+        """Index `workout` as the `number`th of `family`, replacing the previous."""
+        old = self._ids.get((family, number))
+        if old is not None:
+            if self.entries[old].workout == workout:
+                return
+            self._remove(old)
+
+        entry = describe(family, number, workout, self.profile)
+        i = len(self.entries)
+        self.entries.append(entry)
+        self._ids[family, number] = i
+
+        self._sets["family"][family].add(i)
+        self._sets["number"][number].add(i)
+        for step in entry.steps:
+            self._sets["steps"][step].add(i)
+        for key, value in self._values(entry):
+            bisect.insort(self._sorted[key], (value, i))
+
+    def _remove(self, i: int) -> None:
+        entry = self.entries[i]
+        self.entries[i] = None
+        del self._ids[entry.family, entry.number]
+
+        self._sets["family"][entry.family].discard(i)
+        self._sets["number"][entry.number].discard(i)
+        for step in entry.steps:
+            self._sets["steps"][step].discard(i)
+        for key, value in self._values(entry):
+            values = self._sorted[key]
+            del values[bisect.bisect_left(values, (value, i))]
+
+    @staticmethod
+    def _values(entry: Indexed) -> t.Iterator[tuple[t.Any, float]]:
+        yield "minutes", entry.minutes
+        yield "km", entry.km
+        yield from entry.zones.items()
+
+    def _range(self, key: t.Any, bounds: Range) -> set[int]:
+        low, high = bounds
+        values = self._sorted[key]
+        start = 0 if low is None else bisect.bisect_left(values, (low, -1))
+        end = (
+            len(values)
+            if high is None
+            else bisect.bisect_right(values, (high, math.inf))
+        )
+        return {i for _, i in values[start:end]}
+
+    def query(
+        self,
+        family: str | Collection[str] | None = None,
+        number: int | Collection[int] | None = None,
+        steps: Collection[str] = (),
+        minutes: Range | None = None,
+        km: Range | None = None,
+        zones: Mapping[int, Range] | None = None,
+    ) -> list[Indexed]:
+        """Entries of any of `family` and `number`, with all the `steps` types,
+        and within the ranges of `minutes`, `km` and minutes per zone.
+        """
+        filters: list[set[int]] = []
+        for key, wanted in ("family", family), ("number", number):
+            if wanted is None:
+                continue
+            if isinstance(wanted, (str, int)):
+                wanted = [wanted]
+            index = self._sets[key]
+            filters.append(set().union(*(index.get(value, ()) for value in wanted)))
+        for step in steps:
+            filters.append(self._sets["steps"].get(step, set()))
+        for key, bounds in ("minutes", minutes), ("km", km), *(zones or {}).items():
+            if bounds is not None:
+                filters.append(self._range(key, bounds))
+
+        if not filters:
+            ids = set(self._ids.values())
+        else:
+            filters.sort(key=len)
+            ids = filters[0].intersection(*filters[1:])
+        return [self.entries[i] for i in sorted(ids)]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    def bounds(arg: str) -> Range:
+        low, _, high = arg.partition(":")
+        return (float(low) if low else None, float(high) if high else None)
+
+    parser = argparse.ArgumentParser(
+        description="Search the workout catalog. Ranges are written LOW:HIGH,"
+        " either bound may be omitted."
+    )
+    parser.add_argument(
+        "-f",
+        "--family",
+        action="append",
+        help="Workout family, e.g. 'Tempo runs'. May be repeated.",
+    )
+    parser.add_argument(
+        "-s",
+        "--step",
+        action="append",
+        default=[],
+        help="Step type every workout must have, e.g. Repeat. May be repeated.",
+    )
+    parser.add_argument("--minutes", type=bounds, metavar="RANGE")
+    parser.add_argument("--km", type=bounds, metavar="RANGE")
+    parser.add_argument(
+        "-z",
+        "--zone",
+        action="append",
+        default=[],
+        metavar="N=RANGE",
+        help="Minutes in HR zone N, e.g. 3=20: for at least 20. May be repeated.",
+    )
+    args = parser.parse_args()
+
+    index = CatalogIndex.from_catalogs(runs)
+    zones = {int(n): bounds(r) for n, _, r in (z.partition("=") for z in args.zone)}
+    for entry in index.query(
+        family=args.family,
+        steps=args.step,
+        minutes=args.minutes,
+        km=args.km,
+        zones=zones,
+    ):
+        print(
+            f"{entry.workout.name}: {entry.minutes:.0f} min, {entry.km:.1f} km, "
+            + ", ".join(f"HR{n} {m:.0f}" for n, m in entry.zones.items() if m)
+        )
@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+import typing as t
+
+
+class Entry(t.NamedTuple):
+    op: str
+    name: str
+    arg: str | int | None
+
+    @classmethod
+    def from_dict(cls, dct: dict[str, t.Any]) -> "Entry":
+        return cls(dct["op"], dct["name"], dct.get("arg"))
+
+
+class Journal:
+    """Append-only log of the operations sent to Garmin Connect.
+
+    Every operation is written as "planned" before it is sent and as "done"
+    once it succeeded, one JSON object per line, so that an interrupted batch
+    can be resumed from its pending operations. compact() drops the completed
+    operations from the file.
+    """
+
+    def __init__(self, path: str | os.PathLike, fsync: bool = True) -> None:
+        self.path = path
+        self.fsync = fsync
+
+        self._lock = threading.Lock()
+        self._pending: dict[Entry, None] = {}
+        self._read()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _read(self) -> None:
+        try:
+            file = open(self.path, encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                    entry = Entry.from_dict(record)
+                except (ValueError, KeyError):
+                    # Torn write of a crashed run.
+                    continue
+                if record.get("state") == "done":
+                    self._pending.pop(entry, None)
+                else:
+                    self._pending[entry] = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def pending(self) -> list[Entry]:
+        with self._lock:
+            return list(self._pending)
+
+    @staticmethod
+    def _line(entry: Entry, state: str) -> str:
+        record = {"op": entry.op, "name": entry.name, "state": state}
+        if entry.arg is not None:
+            record["arg"] = entry.arg
+        return json.dumps(record) + "\n"
+
+    def _sync(self, file: t.IO[str]) -> None:
+        file.flush()
+        if self.fsync:
+            os.fsync(file.fileno())
+
+    def _write(self, entry: Entry, state: str) -> None:
+        with self._lock:
+            if state != "done" and entry in self._pending:
+                # Already planned, e.g. by a whole batch upfront.
+                return
+            self._file.write(self._line(entry, state))
+            self._sync(self._file)
+            if state == "done":
+                self._pending.pop(entry, None)
+            else:
+                self._pending[entry] = None
+
+    def compact(self) -> None:
+        """Rewrite the journal with its pending operations only."""
+        tmp = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp, "w", encoding="utf-8") as file:
+                file.writelines(self._line(entry, "planned") for entry in self._pending)
+                self._sync(file)
+            self._file.close()
+            os.replace(tmp, self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def plan(self, entry: Entry) -> None:
+        self._write(entry, "planned")
+
+    def done(self, entry: Entry) -> None:
+        self._write(entry, "done")
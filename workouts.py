@@ -1,16 +1,96 @@
+import dataclasses
+import functools
+import hashlib
+import typing as t
+import weakref
+from array import array
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
+from dataclasses import dataclass
+from dataclasses import field
 from datetime import timedelta
 
-
 LT = 177
 "Lactate Threshold Heart Rate"
 
 
-class HRZone:
-    def __init__(self, number: int | None, name: str, low: float, high: float) -> None:
-        self.number = number
-        self.name = name
-        self.low = round(low * LT)
-        self.high = round(high * LT)
+def content_digest(*parts: object) -> str:
+    """Canonical content hash of `parts`.
+
+    Composite objects pass the digests of their children, so that the digest
+    of a whole Workout is a Merkle hash of its tree.
+    """
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+class Interned(type):
+    """Metaclass of the immutable model classes.
+
+    Identical objects are built only once: constructing an object equal to a
+    live one returns the live one. `Warmup()` is a single object however many
+    workouts use it.
+    """
+
+    _pools: dict[type, weakref.WeakValueDictionary[str, t.Any]] = {}
+
+    def __call__(cls, *args: t.Any, **kwargs: t.Any) -> t.Any:
+        obj = super().__call__(*args, **kwargs)
+        pool = Interned._pools.get(cls)
+        if pool is None:
+            pool = Interned._pools.setdefault(cls, weakref.WeakValueDictionary())
+        return pool.setdefault(obj.digest, obj)
+
+
+class Model(metaclass=Interned):
+    # Objects are equal when their contents are: compare their digests.
+    __slots__ = ()
+
+    digest: str
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.digest == other.digest
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True, eq=False, init=False)
+class HRZone(Model):
+    number: int | None
+    name: str
+    # Bounds relative to the lactate threshold, and in bpm for `lt`.
+    ratios: tuple[float, float]
+    lt: int
+    low: int
+    high: int
+    digest: str
+
+    def __init__(
+        self, number: int | None, name: str, low: float, high: float, lt: int = LT
+    ) -> None:
+        object.__setattr__(self, "number", number)
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "ratios", (low, high))
+        object.__setattr__(self, "lt", lt)
+        object.__setattr__(self, "low", round(low * lt))
+        object.__setattr__(self, "high", round(high * lt))
+        object.__setattr__(
+            self,
+            "digest",
+            content_digest("HRZone", self.number, self.name, self.low, self.high),
+        )
+
+    @functools.cache
+    def at(self, lt: int) -> "HRZone":
+        if lt == self.lt:
+            return self
+        return HRZone(self.number, self.name, *self.ratios, lt=lt)
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.name!r}, {self.low!r}, {self.high!r})"
@@ -18,9 +98,6 @@ class HRZone:
     def __str__(self) -> str:
         return f"HR[{self.low}-{self.high}]"
 
-    def __hash__(self) -> int:
-        return hash((self.number, self.name, self.low, self.high))
-
 
 HR1 = HRZone(1, "Low Aerobic", 0.75, 0.80)
 HR2 = HRZone(2, "Moderate Aerobic", 0.81, 0.89)
@@ -42,13 +119,22 @@ def mile(miles: float) -> distance:
     return distance(miles * 1.61)
 
 
-class Segment:
-    def __init__(
-        self, duration: timedelta | distance, hr: HRZone, notes: str | None = None
-    ) -> None:
-        self.duration = duration
-        self.hr = hr
-        self.notes = notes
+@dataclass(frozen=True, slots=True, weakref_slot=True, eq=False)
+class Segment(Model):
+    duration: timedelta | distance
+    hr: HRZone
+    notes: str | None = None
+    digest: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if isinstance(self.duration, timedelta):
+            duration = ("time", self.duration.total_seconds())
+        else:
+            duration = ("distance", float(self.duration))
+        digest = content_digest(
+            self.__class__.__name__, duration, self.hr.digest, self.notes
+        )
+        object.__setattr__(self, "digest", digest)
 
     def __repr__(self) -> str:
         return (
@@ -60,909 +146,1122 @@ class Segment:
             f", {self.notes!s})" if self.notes is not None else ")"
         )
 
-    def __hash__(self) -> int:
-        return hash((self.duration, self.hr, self.notes))
+    @functools.cache
+    def at(self, lt: int) -> "Segment":
+        hr = self.hr.at(lt)
+        if hr is self.hr:
+            return self
+        return dataclasses.replace(self, hr=hr)
 
 
+@dataclass(frozen=True, slots=True, eq=False, repr=False)
 class Warmup(Segment):
-    def __init__(
-        self, duration: timedelta | distance = min(5), hr: HRZone = HR1
-    ) -> None:
-        super().__init__(duration, hr)
+    duration: timedelta | distance = min(5)
+    hr: HRZone = HR1
 
 
+@dataclass(frozen=True, slots=True, eq=False, repr=False)
 class Cooldown(Segment):
-    def __init__(
-        self, duration: timedelta | distance = min(5), hr: HRZone = HR1
-    ) -> None:
-        super().__init__(duration, hr)
+    duration: timedelta | distance = min(5)
+    hr: HRZone = HR1
 
 
+@dataclass(frozen=True, slots=True, eq=False, repr=False)
 class Recovery(Segment):
-    def __init__(
-        self, duration: timedelta | distance = min(2), hr: HRZone = HR1
-    ) -> None:
-        super().__init__(duration, hr)
+    duration: timedelta | distance = min(2)
+    hr: HRZone = HR1
 
 
-class Repeat:
-    def __init__(self, count: int, steps: list[Segment]) -> None:
-        self.count = count
-        self.steps = steps
+# Repeats nest: a Repeat of Repeats is a ladder or a pyramid.
+type Step = Segment | Repeat
 
-    def __hash__(self) -> int:
-        return hash((self.count, self.steps))
 
-    def __repr__(self) -> str:
-        return f"{self.__class__.__name__}({self.count!r}, {self.steps!r})"
+class FlatSteps:
+    """Steps of a workout in pre-order, one compact column per field.
 
-    def __str__(self) -> str:
+    The stepOrder of step i is i + 1. A repeat (kind REPEAT) has a count, and
+    its steps are the ones from i + 1 up to end[i]. The other steps are
+    segments of class classes[kind[i]], with a duration of `value` seconds or
+    km, and HR bounds.
+    """
+
+    REPEAT = 0
+    TIME = 0
+    DISTANCE = 1
+
+    __slots__ = (
+        "classes",
+        "kind",
+        "depth",
+        "parent",
+        "end",
+        "count",
+        "unit",
+        "value",
+        "zone",
+        "low",
+        "high",
+        "notes",
+    )
+
+    def __init__(self, steps: t.Iterable[Step]) -> None:
+        self.classes: list[type] = [Repeat]
+        self.kind = array("B")
+        self.depth = array("H")
+        self.parent = array("i")
+        self.end = array("I")
+        self.count = array("I")
+        self.unit = array("B")
+        self.value = array("d")
+        self.zone = array("b")
+        self.low = array("H")
+        self.high = array("H")
+        self.notes: list[str | None] = []
+
+        stack = [(iter(steps), -1)]
+        while stack:
+            remaining, parent = stack[-1]
+            step = next(remaining, None)
+            if step is None:
+                stack.pop()
+                if parent >= 0:
+                    self.end[parent] = len(self.kind)
+                continue
+
+            i = len(self.kind)
+            self.depth.append(len(stack) - 1)
+            self.parent.append(parent)
+            self.end.append(i + 1)
+            if isinstance(step, Repeat):
+                self.kind.append(self.REPEAT)
+                self.count.append(step.count)
+                self.unit.append(self.TIME)
+                self.value.append(0.0)
+                self.zone.append(-1)
+                self.low.append(0)
+                self.high.append(0)
+                self.notes.append(None)
+                stack.append((iter(step.steps), i))
+                continue
+
+            if step.__class__ not in self.classes:
+                self.classes.append(step.__class__)
+            self.kind.append(self.classes.index(step.__class__))
+            self.count.append(0)
+            if isinstance(step.duration, timedelta):
+                self.unit.append(self.TIME)
+                self.value.append(step.duration.total_seconds())
+            else:
+                self.unit.append(self.DISTANCE)
+                self.value.append(float(step.duration))
+            self.zone.append(-1 if step.hr.number is None else step.hr.number)
+            self.low.append(step.hr.low)
+            self.high.append(step.hr.high)
+            self.notes.append(step.notes)
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def describe(self, i: int) -> str:
+        # Same as str() of the step, without its steps for a repeat.
+        if self.kind[i] == self.REPEAT:
+            return f"Rep x{self.count[i]}"
+        if self.unit[i] == self.TIME:
+            duration = str(timedelta(seconds=self.value[i]))
+        else:
+            duration = str(distance(self.value[i]))
+        notes = self.notes[i]
         return (
-            f"Rep x{self.count} [" + ", ".join(f"{step!s}" for step in self.steps) + "]"
+            f"{self.classes[self.kind[i]].__name__}({duration}"
+            f" at HR[{self.low[i]}-{self.high[i]}]"
+            + (f", {notes!s})" if notes is not None else ")")
         )
 
 
-type Step = Segment | Repeat
+@dataclass(frozen=True, slots=True, weakref_slot=True, eq=False)
+class Repeat(Model):
+    count: int
+    steps: tuple[Step, ...]
+    digest: str = field(init=False, repr=False)
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "steps", tuple(self.steps))
+        digest = content_digest(
+            "Repeat", self.count, *(step.digest for step in self.steps)
+        )
+        object.__setattr__(self, "digest", digest)
 
-class Workout:
-    def __init__(self, steps: list[Step], name: str) -> None:
-        self.steps = steps
-        self.name = name
+    @functools.cache
+    def at(self, lt: int) -> "Repeat":
+        steps = steps_at(self.steps, lt)
+        if steps == self.steps:
+            return self
+        return Repeat(self.count, steps)
 
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}({self.name!r}, {self.steps!r})"
+        return f"{self.__class__.__name__}({self.count!r}, {list(self.steps)!r})"
+
+    def __str__(self) -> str:
+        # Without recursion, as repeats may nest thousands deep: the stack
+        # holds the steps left to print and the text between them.
+        parts: list[str] = []
+        stack: list[Step | str] = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+            elif isinstance(item, Repeat):
+                parts.append(f"Rep x{item.count} [")
+                stack.append("]")
+                for i, step in reversed(list(enumerate(item.steps))):
+                    stack.append(step)
+                    if i:
+                        stack.append(", ")
+            else:
+                parts.append(str(item))
+        return "".join(parts)
+
+
+def steps_at(steps: tuple[Step, ...], lt: int) -> tuple[Step, ...]:
+    """`steps` for the lactate threshold `lt`, the unchanged ones kept.
+
+    Iterative: the innermost repeats are rebuilt first.
+    """
+    stack: list[tuple[Iterator[Step], list[Step], Repeat | None]] = [
+        (iter(steps), [], None)
+    ]
+    while True:
+        remaining, done, repeat = stack[-1]
+        step = next(remaining, None)
+        if isinstance(step, Repeat):
+            stack.append((iter(step.steps), [], step))
+            continue
+        if step is not None:
+            done.append(step.at(lt))
+            continue
+
+        stack.pop()
+        if repeat is None:
+            return tuple(done)
+        if all(new is old for new, old in zip(done, repeat.steps)):
+            stack[-1][1].append(repeat)
+        else:
+            stack[-1][1].append(Repeat(repeat.count, done))
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True, eq=False)
+class Workout(Model):
+    steps: tuple[Step, ...]
+    name: str
+    digest: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "steps", tuple(self.steps))
+        digest = content_digest(
+            "Workout", self.name, *(step.digest for step in self.steps)
+        )
+        object.__setattr__(self, "digest", digest)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.name!r}, {list(self.steps)!r})"
 
     def __str__(self) -> str:
         return self.name
 
+    @functools.cache
+    def at(self, lt: int) -> "Workout":
+        """This workout for an athlete whose lactate threshold is `lt`.
+
+        Instances are cached per (workout, lt), so that every athlete with the
+        same threshold shares them, and their payloads.
+        """
+        steps = steps_at(self.steps, lt)
+        if steps == self.steps:
+            return self
+        return Workout(steps, name=self.name)
+
+    @functools.cache
+    def flat(self) -> FlatSteps:
+        return FlatSteps(self.steps)
+
+    @functools.cache
+    def payload_key(self) -> str:
+        """Digest of what the payload of this workout carries.
+
+        Unlike `digest`, it leaves out the bpm of numbered zones, which are not
+        uploaded: the instances of a workout at every lactate threshold share
+        their key when all its zones are numbered.
+        """
+        flat = self.flat()
+        bounds = [
+            (i, flat.low[i], flat.high[i])
+            for i in range(len(flat))
+            if flat.kind[i] != flat.REPEAT and flat.zone[i] < 0
+        ]
+        return content_digest(
+            "Workout",
+            self.name,
+            [cls.__name__ for cls in flat.classes],
+            *(
+                column.tobytes()
+                for column in (
+                    flat.kind,
+                    flat.parent,
+                    flat.count,
+                    flat.unit,
+                    flat.value,
+                    flat.zone,
+                )
+            ),
+            bounds,
+            flat.notes,
+        )
+
     def display(self) -> str:
-        return f"{self.name}: " + "".join(f"\n  {step!s}" for step in self.steps)
-
-
-recovery_run: dict[int, Workout] = {
-    1: Workout([Segment(min(20), HR1)], name="Recovery run 1"),
-    2: Workout([Segment(min(25), HR1)], name="Recovery run 2"),
-    3: Workout([Segment(min(30), HR1)], name="Recovery run 3"),
-    4: Workout([Segment(min(35), HR1)], name="Recovery run 4"),
-    5: Workout([Segment(min(40), HR1)], name="Recovery run 5"),
-    6: Workout([Segment(min(45), HR1)], name="Recovery run 6"),
-    7: Workout([Segment(min(50), HR1)], name="Recovery run 7"),
-    8: Workout([Segment(min(55), HR1)], name="Recovery run 8"),
-    9: Workout([Segment(min(60), HR1)], name="Recovery run 9"),
-}
+        flat = self.flat()
+        parts = [f"{self.name}: "]
+        for i in range(len(flat)):
+            parent = flat.parent[i]
+            if parent < 0:
+                parts.append("\n  ")
+            elif i > parent + 1:
+                parts.append(", ")
+            parts.append(flat.describe(i))
+            if flat.kind[i] == flat.REPEAT:
+                parts.append(" [")
+            # Close the repeats whose last step this is.
+            j = i if flat.kind[i] == flat.REPEAT else parent
+            while j >= 0 and flat.end[j] == i + 1:
+                parts.append("]")
+                j = flat.parent[j]
+        return "".join(parts)
 
 
-foundation_run: dict[int, Workout] = {
-    1: Workout([Warmup(), Segment(min(10), HR2), Cooldown()], name="Foundation run 1"),
-    2: Workout([Warmup(), Segment(min(15), HR2), Cooldown()], name="Foundation run 2"),
-    3: Workout([Warmup(), Segment(min(20), HR2), Cooldown()], name="Foundation run 3"),
-    4: Workout([Warmup(), Segment(min(25), HR2), Cooldown()], name="Foundation run 4"),
-    5: Workout([Warmup(), Segment(min(30), HR2), Cooldown()], name="Foundation run 5"),
-    6: Workout([Warmup(), Segment(min(35), HR2), Cooldown()], name="Foundation run 6"),
-    7: Workout([Warmup(), Segment(min(40), HR2), Cooldown()], name="Foundation run 7"),
-    8: Workout([Warmup(), Segment(min(45), HR2), Cooldown()], name="Foundation run 8"),
-    9: Workout([Warmup(), Segment(min(50), HR2), Cooldown()], name="Foundation run 9"),
-}
+class Catalog[K, V](Mapping[K, V]):
+    """Mapping whose values are built on first access.
 
-long_run: dict[int, Workout] = {
-    1: Workout(
-        [Warmup(mile(1)), Segment(mile(4.5), HR2), Cooldown(mile(0.5))],
-        name="Long run 1",
-    ),
-    2: Workout(
-        [Warmup(mile(1)), Segment(mile(5.5), HR2), Cooldown(mile(0.5))],
-        name="Long run 2",
-    ),
-    3: Workout(
-        [Warmup(mile(1)), Segment(mile(6.5), HR2), Cooldown(mile(0.5))],
-        name="Long run 3",
-    ),
-    4: Workout(
-        [Warmup(mile(1)), Segment(mile(7.5), HR2), Cooldown(mile(0.5))],
-        name="Long run 4",
-    ),
-    5: Workout(
-        [Warmup(mile(1)), Segment(mile(8.5), HR2), Cooldown(mile(0.5))],
-        name="Long run 5",
-    ),
-    6: Workout(
-        [Warmup(mile(1)), Segment(mile(9.5), HR2), Cooldown(mile(0.5))],
-        name="Long run 6",
-    ),
-    7: Workout(
-        [Warmup(mile(1)), Segment(mile(10.5), HR2), Cooldown(mile(0.5))],
-        name="Long run 7",
-    ),
-    8: Workout(
-        [Warmup(mile(1)), Segment(mile(11.5), HR2), Cooldown(mile(0.5))],
-        name="Long run 8",
-    ),
-    9: Workout(
-        [Warmup(mile(1)), Segment(mile(12.5), HR2), Cooldown(mile(0.5))],
-        name="Long run 9",
-    ),
-    10: Workout(
-        [Warmup(mile(1)), Segment(mile(13.5), HR2), Cooldown(mile(0.5))],
-        name="Long run 10",
-    ),
-    11: Workout(
-        [Warmup(mile(1)), Segment(mile(14.5), HR2), Cooldown(mile(0.5))],
-        name="Long run 11",
-    ),
-    12: Workout(
-        [Warmup(mile(1)), Segment(mile(15.5), HR2), Cooldown(mile(0.5))],
-        name="Long run 12",
-    ),
-    13: Workout(
-        [Warmup(mile(1)), Segment(mile(16.5), HR2), Cooldown(mile(0.5))],
-        name="Long run 13",
-    ),
-    14: Workout(
-        [Warmup(mile(1)), Segment(mile(17.5), HR2), Cooldown(mile(0.5))],
-        name="Long run 14",
-    ),
-    15: Workout(
-        [Warmup(mile(1)), Segment(mile(18.5), HR2), Cooldown(mile(0.5))],
-        name="Long run 15",
-    ),
-}
+    Building every workout of the catalog takes a while, and most runs only
+    use a few of them.
+    """
 
-fast_finish_run: dict[int, Workout] = {
-    1: Workout(
-        [Warmup(), Segment(min(15), HR2), Segment(min(5), HR3)],
-        name="Fast finish run 1",
-    ),
-    2: Workout(
-        [Warmup(), Segment(min(20), HR2), Segment(min(5), HR3)],
-        name="Fast finish run 2",
-    ),
-    3: Workout(
-        [Warmup(), Segment(min(20), HR2), Segment(min(10), HR3)],
-        name="Fast finish run 3",
-    ),
-    4: Workout(
-        [Warmup(), Segment(min(25), HR2), Segment(min(10), HR3)],
-        name="Fast finish run 4",
-    ),
-    5: Workout(
-        [Warmup(), Segment(min(25), HR2), Segment(min(12), HR3)],
-        name="Fast finish run 5",
-    ),
-    6: Workout(
-        [Warmup(), Segment(min(30), HR2), Segment(min(12), HR3)],
-        name="Fast finish run 6",
-    ),
-    7: Workout(
-        [Warmup(), Segment(min(35), HR2), Segment(min(12), HR3)],
-        name="Fast finish run 7",
-    ),
-    8: Workout(
-        [Warmup(), Segment(min(35), HR2), Segment(min(15), HR3)],
-        name="Fast finish run 8",
-    ),
-    9: Workout(
-        [Warmup(), Segment(min(40), HR2), Segment(min(15), HR3)],
-        name="Fast finish run 9",
-    ),
-    10: Workout(
-        [Warmup(), Segment(min(45), HR2), Segment(min(15), HR3)],
-        name="Fast finish run 10",
-    ),
-}
+    def __init__(self, builders: Mapping[K, Callable[[], V]]) -> None:
+        self._builders = builders
+        self._built: dict[K, V] = {}
 
-tempo_run: dict[int, Workout] = {
-    1: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Segment(min(15), HR3),
-            Segment(min(5), HR2),
-            Cooldown(),
-        ],
-        name="Tempo run 1",
-    ),
-    2: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Segment(min(18), HR3),
-            Segment(min(5), HR2),
-            Cooldown(),
-        ],
-        name="Tempo run 2",
-    ),
-    3: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Segment(min(20), HR3),
-            Segment(min(5), HR2),
-            Cooldown(),
-        ],
-        name="Tempo run 3",
-    ),
-    4: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Segment(min(24), HR3),
-            Segment(min(5), HR2),
-            Cooldown(),
-        ],
-        name="Tempo run 4",
-    ),
-    5: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Segment(min(28), HR3),
-            Segment(min(5), HR2),
-            Cooldown(),
-        ],
-        name="Tempo run 5",
-    ),
-    6: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Segment(min(30), HR3),
-            Segment(min(5), HR2),
-            Cooldown(),
-        ],
-        name="Tempo run 6",
-    ),
-    7: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Segment(min(32), HR3),
-            Segment(min(5), HR2),
-            Cooldown(),
-        ],
-        name="Tempo run 7",
-    ),
-    8: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Segment(min(36), HR3),
-            Segment(min(5), HR2),
-            Cooldown(),
-        ],
-        name="Tempo run 8",
-    ),
-    9: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Segment(min(40), HR3),
-            Segment(min(5), HR2),
-            Cooldown(),
-        ],
-        name="Tempo run 9",
-    ),
-    10: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Segment(min(45), HR3),
-            Segment(min(5), HR2),
-            Cooldown(),
-        ],
-        name="Tempo run 10",
-    ),
-}
+    @classmethod
+    def parametric(cls, build: Callable[[K], V], keys: Iterable[K]) -> "Catalog[K, V]":
+        return cls({key: functools.partial(build, key) for key in keys})
 
-cruise_interval_run: dict[int, Workout] = {
-    1: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(4, [Segment(min(5), HR3), Recovery(min(3))]),
-            Segment(min(5), HR2),
-            Cooldown(),
-        ],
-        name="Cruise interval run 1",
-    ),
-    2: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(4, [Segment(min(8), HR3), Recovery(min(3))]),
-            Segment(min(5), HR2),
-            Cooldown(),
-        ],
-        name="Cruise interval run 2",
-    ),
-    3: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(4, [Segment(min(10), HR3), Recovery(min(3))]),
-            Segment(min(5), HR2),
-            Cooldown(),
-        ],
-        name="Cruise interval run 3",
-    ),
-    4: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(4, [Segment(min(12), HR3), Recovery(min(3))]),
-            Segment(min(5), HR2),
-            Cooldown(),
-        ],
-        name="Cruise interval run 4",
-    ),
-    5: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(4, [Segment(min(15), HR3), Recovery(min(3))]),
-            Segment(min(5), HR2),
-            Cooldown(),
-        ],
-        name="Cruise interval run 5",
-    ),
-}
+    def __getitem__(self, key: K) -> V:
+        try:
+            return self._built[key]
+        except KeyError:
+            # Concurrent first accesses build equal, hence interned, workouts.
+            return self._built.setdefault(key, self._builders[key]())
 
-long_run_with_speed_play: dict[int, Workout] = {
-    1: Workout(
-        [
-            Warmup(mile(0.5)),
-            Segment(mile(1), HR2),
-            Repeat(8, [Segment(mile(0.25), HR3), Segment(mile(0.75), HR2)]),
-            Cooldown(mile(0.5)),
-        ],
-        name="Long run with speed play 1",
-    ),
-    2: Workout(
-        [
-            Warmup(mile(0.5)),
-            Segment(mile(1), HR2),
-            Repeat(10, [Segment(mile(0.25), HR3), Segment(mile(0.75), HR2)]),
-            Cooldown(mile(0.5)),
-        ],
-        name="Long run with speed play 2",
-    ),
-    3: Workout(
-        [
-            Warmup(mile(0.5)),
-            Segment(mile(1), HR2),
-            Repeat(12, [Segment(mile(0.25), HR3), Segment(mile(0.75), HR2)]),
-            Cooldown(mile(0.5)),
-        ],
-        name="Long run with speed play 3",
-    ),
-    4: Workout(
-        [
-            Warmup(mile(0.5)),
-            Segment(mile(1), HR2),
-            Repeat(14, [Segment(mile(0.25), HR3), Segment(mile(0.75), HR2)]),
-            Cooldown(mile(0.5)),
-        ],
-        name="Long run with speed play 4",
-    ),
-    5: Workout(
-        [
-            Warmup(mile(0.5)),
-            Segment(mile(1), HR2),
-            Repeat(16, [Segment(mile(0.25), HR3), Segment(mile(0.75), HR2)]),
-            Cooldown(mile(0.5)),
-        ],
-        name="Long run with speed play 5",
-    ),
-    6: Workout(
-        [
-            Warmup(mile(0.5)),
-            Segment(mile(1), HR2),
-            Repeat(18, [Segment(mile(0.25), HR3), Segment(mile(0.75), HR2)]),
-            Cooldown(mile(0.5)),
-        ],
-        name="Long run with speed play 6",
-    ),
-}
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._builders)
 
-long_run_with_fast_finish: dict[int, Workout] = {
-    1: Workout(
-        [Warmup(mile(0.5)), Segment(mile(8.5), HR2), Segment(mile(1), HR3)],
-        name="Long run with fast finish 1",
-    ),
-    2: Workout(
-        [Warmup(mile(0.5)), Segment(mile(10.5), HR2), Segment(mile(1), HR3)],
-        name="Long run with fast finish 2",
-    ),
-    3: Workout(
-        [Warmup(mile(0.5)), Segment(mile(12), HR2), Segment(mile(1), HR3)],
-        name="Long run with fast finish 3",
-    ),
-    4: Workout(
-        [Warmup(mile(0.5)), Segment(mile(14), HR2), Segment(mile(1), HR3)],
-        name="Long run with fast finish 4",
-    ),
-    5: Workout(
-        [Warmup(mile(0.5)), Segment(mile(15.5), HR2), Segment(mile(1), HR3)],
-        name="Long run with fast finish 5",
-    ),
-    6: Workout(
-        [Warmup(mile(0.5)), Segment(mile(17.5), HR2), Segment(mile(1), HR3)],
-        name="Long run with fast finish 6",
-    ),
-}
+    def __len__(self) -> int:
+        return len(self._builders)
 
-speed_play_run: dict[int, Workout] = {
-    1: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(3, [Segment(min(2), HR4), Recovery()]),
-            Cooldown(),
-        ],
-        name="Speed play run 1",
-    ),
-    2: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(5, [Segment(min(1), HR5), Recovery()]),
-            Cooldown(),
-        ],
-        name="Speed play run 2",
-    ),
-    3: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(4, [Segment(min(2), HR4), Recovery()]),
-            Cooldown(),
-        ],
-        name="Speed play run 3",
-    ),
-    4: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(6, [Segment(min(1), HR5), Recovery()]),
-            Cooldown(),
-        ],
-        name="Speed play run 4",
-    ),
-    5: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(5, [Segment(min(2), HR4), Recovery()]),
-            Cooldown(),
-        ],
-        name="Speed play run 5",
-    ),
-    6: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(7, [Segment(min(1), HR5), Recovery()]),
-            Cooldown(),
-        ],
-        name="Speed play run 6",
-    ),
-    7: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(6, [Segment(min(2), HR4), Recovery()]),
-            Cooldown(),
-        ],
-        name="Speed play run 7",
-    ),
-    8: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(8, [Segment(min(1), HR5), Recovery()]),
-            Cooldown(),
-        ],
-        name="Speed play run 8",
-    ),
-    9: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(9, [Segment(min(1), HR5), Recovery()]),
-            Cooldown(),
-        ],
-        name="Speed play run 9",
-    ),
-    10: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(7, [Segment(min(2), HR4), Recovery()]),
-            Cooldown(),
-        ],
-        name="Speed play run 10",
-    ),
-    11: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(10, [Segment(min(1), HR5), Recovery()]),
-            Cooldown(),
-        ],
-        name="Speed play run 11",
-    ),
-    12: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(8, [Segment(min(2), HR4), Recovery()]),
-            Cooldown(),
-        ],
-        name="Speed play run 12",
-    ),
-    13: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(9, [Segment(min(2), HR4), Recovery()]),
-            Cooldown(),
-        ],
-        name="Speed play run 13",
-    ),
-    14: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(12, [Segment(min(1), HR5), Recovery()]),
-            Cooldown(),
-        ],
-        name="Speed play run 14",
-    ),
-}
 
-hill_repetition_run: dict[int, Workout] = {
-    1: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(6, [Segment(min(0.5), HR5, "Uphill"), Recovery(min(1.5))]),
-            Cooldown(),
-        ],
-        name="Hill repetition run 1",
-    ),
-    2: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(8, [Segment(min(0.5), HR5, "Uphill"), Recovery(min(1.5))]),
-            Cooldown(),
-        ],
-        name="Hill repetition run 2",
-    ),
-    3: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(6, [Segment(min(1), HR5, "Uphill"), Recovery(min(2))]),
-            Cooldown(),
-        ],
-        name="Hill repetition run 3",
-    ),
-    4: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(10, [Segment(min(0.5), HR5, "Uphill"), Recovery(min(1.5))]),
-            Cooldown(),
-        ],
-        name="Hill repetition run 4",
-    ),
-    5: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(12, [Segment(min(0.5), HR5, "Uphill"), Recovery(min(1.5))]),
-            Cooldown(),
-        ],
-        name="Hill repetition run 5",
-    ),
-    6: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(8, [Segment(min(1), HR5, "Uphill"), Recovery(min(2))]),
-            Cooldown(),
-        ],
-        name="Hill repetition run 6",
-    ),
-    7: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(6, [Segment(min(1.5), HR5, "Uphill"), Recovery(min(2.5))]),
-            Cooldown(),
-        ],
-        name="Hill repetition run 7",
-    ),
-    8: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(10, [Segment(min(1), HR5, "Uphill"), Recovery(min(2))]),
-            Cooldown(),
-        ],
-        name="Hill repetition run 8",
-    ),
-    9: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(8, [Segment(min(1.5), HR5, "Uphill"), Recovery(min(2.5))]),
-            Cooldown(),
-        ],
-        name="Hill repetition run 9",
-    ),
-    10: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(12, [Segment(min(1), HR5, "Uphill"), Recovery(min(2))]),
-            Cooldown(),
-        ],
-        name="Hill repetition run 10",
-    ),
-    11: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(10, [Segment(min(1.5), HR5, "Uphill"), Recovery(min(2.5))]),
-            Cooldown(),
-        ],
-        name="Hill repetition run 11",
-    ),
-    12: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(12, [Segment(min(1.5), HR5, "Uphill"), Recovery(min(2.5))]),
-            Cooldown(),
-        ],
-        name="Hill repetition run 12",
-    ),
-}
+recovery_run: Catalog[int, Workout] = Catalog.parametric(
+    lambda n: Workout([Segment(min(15 + 5 * n), HR1)], name=f"Recovery run {n}"),
+    range(1, 10),
+)
 
-short_interval_run: dict[int, Workout] = {
-    1: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(6, [Segment(min(1), HR5), Recovery(min(2))]),
-            Cooldown(),
-        ],
-        name="Short interval run 1",
-    ),
-    2: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(8, [Segment(min(1), HR5), Recovery(min(2))]),
-            Cooldown(),
-        ],
-        name="Short interval run 2",
-    ),
-    3: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(6, [Segment(min(1.5), HR5), Recovery(min(2.5))]),
-            Cooldown(),
-        ],
-        name="Short interval run 3",
+foundation_run: Catalog[int, Workout] = Catalog.parametric(
+    lambda n: Workout(
+        [Warmup(), Segment(min(5 + 5 * n), HR2), Cooldown()],
+        name=f"Foundation run {n}",
     ),
-    4: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(10, [Segment(min(1), HR5), Recovery(min(2.5))]),
-            Cooldown(),
-        ],
-        name="Short interval run 4",
-    ),
-    5: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(8, [Segment(min(1.5), HR5), Recovery(min(2))]),
-            Cooldown(),
-        ],
-        name="Short interval run 5",
-    ),
-    6: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(12, [Segment(min(1), HR5), Recovery(min(2))]),
-            Cooldown(),
-        ],
-        name="Short interval run 6",
-    ),
-    7: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(10, [Segment(min(1.5), HR5), Recovery(min(2.5))]),
-            Cooldown(),
-        ],
-        name="Short interval run 7",
-    ),
-    8: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(12, [Segment(min(1.5), HR5), Recovery(min(2.5))]),
-            Cooldown(),
-        ],
-        name="Short interval run 8",
-    ),
-}
+    range(1, 10),
+)
 
-long_interval_run: dict[int, Workout] = {
-    1: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(3, [Segment(min(3), HR4), Recovery(min(2))]),
-            Cooldown(),
-        ],
-        name="Long interval run 1",
-    ),
-    2: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(4, [Segment(min(3), HR4), Recovery(min(2))]),
-            Cooldown(),
-        ],
-        name="Long interval run 2",
-    ),
-    3: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(3, [Segment(min(5), HR4), Recovery(min(3))]),
-            Cooldown(),
-        ],
-        name="Long interval run 3",
-    ),
-    4: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(5, [Segment(min(3), HR4), Recovery(min(2))]),
-            Cooldown(),
-        ],
-        name="Long interval run 4",
-    ),
-    5: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(6, [Segment(min(3), HR4), Recovery(min(2))]),
-            Cooldown(),
-        ],
-        name="Long interval run 5",
-    ),
-    6: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(4, [Segment(min(5), HR4), Recovery(min(3))]),
-            Cooldown(),
-        ],
-        name="Long interval run 6",
+long_run: Catalog[int, Workout] = Catalog.parametric(
+    lambda n: Workout(
+        [Warmup(mile(1)), Segment(mile(3.5 + n), HR2), Cooldown(mile(0.5))],
+        name=f"Long run {n}",
     ),
-    7: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(5, [Segment(min(5), HR4), Recovery(min(3))]),
-            Cooldown(),
-        ],
-        name="Long interval run 7",
-    ),
-    8: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(6, [Segment(min(5), HR4), Recovery(min(3))]),
-            Cooldown(),
-        ],
-        name="Long interval run 8",
-    ),
-    9: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(7, [Segment(min(5), HR4), Recovery(min(3))]),
-            Cooldown(),
-        ],
-        name="Long interval run 9",
-    ),
-    10: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(8, [Segment(min(5), HR4), Recovery(min(3))]),
-            Cooldown(),
-        ],
-        name="Long interval run 10",
-    ),
-}
+    range(1, 16),
+)
 
-mixed_interval_run: dict[int, Workout] = {
-    1: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Segment(min(1), HR5),
-            Recovery(),
-            Segment(min(3), HR4),
-            Recovery(),
-            Segment(min(5), HR3),
-            Recovery(),
-            Segment(min(3), HR4),
-            Recovery(),
-            Segment(min(1), HR5),
-            Cooldown(),
-        ],
-        name="Mixed interval run 1",
-    ),
-    2: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Segment(min(1.5), HR5),
-            Recovery(),
-            Segment(min(5), HR4),
-            Recovery(),
-            Segment(min(10), HR3),
-            Recovery(),
-            Segment(min(5), HR4),
-            Recovery(),
-            Segment(min(1.5), HR5),
-            Cooldown(),
-        ],
-        name="Mixed interval run 2",
-    ),
-    3: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(2, [Segment(min(1), HR5), Recovery()]),
-            Repeat(2, [Segment(min(3), HR4), Recovery()]),
-            Segment(min(10), HR3),
-            Recovery(),
-            Repeat(2, [Segment(min(3), HR4), Recovery()]),
-            Repeat(2, [Segment(min(1), HR5), Recovery()]),
-            Cooldown(),
-        ],
-        name="Mixed interval run 3",
-    ),
-    4: Workout(
-        [
-            Warmup(),
-            Segment(min(5), HR2),
-            Repeat(2, [Segment(min(1.5), HR5), Recovery(min(2.5))]),
-            Repeat(2, [Segment(min(5), HR4), Recovery()]),
-            Segment(min(10), HR3),
-            Recovery(),
-            Repeat(2, [Segment(min(1.5), HR5), Recovery()]),
-            Repeat(2, [Segment(min(5), HR4), Recovery()]),
-            Cooldown(),
-        ],
-        name="Mixed interval run 4",
-    ),
-}
+fast_finish_run: Catalog[int, Workout] = Catalog(
+    {
+        1: lambda: Workout(
+            [Warmup(), Segment(min(15), HR2), Segment(min(5), HR3)],
+            name="Fast finish run 1",
+        ),
+        2: lambda: Workout(
+            [Warmup(), Segment(min(20), HR2), Segment(min(5), HR3)],
+            name="Fast finish run 2",
+        ),
+        3: lambda: Workout(
+            [Warmup(), Segment(min(20), HR2), Segment(min(10), HR3)],
+            name="Fast finish run 3",
+        ),
+        4: lambda: Workout(
+            [Warmup(), Segment(min(25), HR2), Segment(min(10), HR3)],
+            name="Fast finish run 4",
+        ),
+        5: lambda: Workout(
+            [Warmup(), Segment(min(25), HR2), Segment(min(12), HR3)],
+            name="Fast finish run 5",
+        ),
+        6: lambda: Workout(
+            [Warmup(), Segment(min(30), HR2), Segment(min(12), HR3)],
+            name="Fast finish run 6",
+        ),
+        7: lambda: Workout(
+            [Warmup(), Segment(min(35), HR2), Segment(min(12), HR3)],
+            name="Fast finish run 7",
+        ),
+        8: lambda: Workout(
+            [Warmup(), Segment(min(35), HR2), Segment(min(15), HR3)],
+            name="Fast finish run 8",
+        ),
+        9: lambda: Workout(
+            [Warmup(), Segment(min(40), HR2), Segment(min(15), HR3)],
+            name="Fast finish run 9",
+        ),
+        10: lambda: Workout(
+            [Warmup(), Segment(min(45), HR2), Segment(min(15), HR3)],
+            name="Fast finish run 10",
+        ),
+    }
+)
+
+tempo_run: Catalog[int, Workout] = Catalog(
+    {
+        1: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Segment(min(15), HR3),
+                Segment(min(5), HR2),
+                Cooldown(),
+            ],
+            name="Tempo run 1",
+        ),
+        2: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Segment(min(18), HR3),
+                Segment(min(5), HR2),
+                Cooldown(),
+            ],
+            name="Tempo run 2",
+        ),
+        3: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Segment(min(20), HR3),
+                Segment(min(5), HR2),
+                Cooldown(),
+            ],
+            name="Tempo run 3",
+        ),
+        4: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Segment(min(24), HR3),
+                Segment(min(5), HR2),
+                Cooldown(),
+            ],
+            name="Tempo run 4",
+        ),
+        5: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Segment(min(28), HR3),
+                Segment(min(5), HR2),
+                Cooldown(),
+            ],
+            name="Tempo run 5",
+        ),
+        6: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Segment(min(30), HR3),
+                Segment(min(5), HR2),
+                Cooldown(),
+            ],
+            name="Tempo run 6",
+        ),
+        7: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Segment(min(32), HR3),
+                Segment(min(5), HR2),
+                Cooldown(),
+            ],
+            name="Tempo run 7",
+        ),
+        8: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Segment(min(36), HR3),
+                Segment(min(5), HR2),
+                Cooldown(),
+            ],
+            name="Tempo run 8",
+        ),
+        9: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Segment(min(40), HR3),
+                Segment(min(5), HR2),
+                Cooldown(),
+            ],
+            name="Tempo run 9",
+        ),
+        10: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Segment(min(45), HR3),
+                Segment(min(5), HR2),
+                Cooldown(),
+            ],
+            name="Tempo run 10",
+        ),
+    }
+)
+
+cruise_interval_run: Catalog[int, Workout] = Catalog(
+    {
+        1: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(4, [Segment(min(5), HR3), Recovery(min(3))]),
+                Segment(min(5), HR2),
+                Cooldown(),
+            ],
+            name="Cruise interval run 1",
+        ),
+        2: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(4, [Segment(min(8), HR3), Recovery(min(3))]),
+                Segment(min(5), HR2),
+                Cooldown(),
+            ],
+            name="Cruise interval run 2",
+        ),
+        3: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(4, [Segment(min(10), HR3), Recovery(min(3))]),
+                Segment(min(5), HR2),
+                Cooldown(),
+            ],
+            name="Cruise interval run 3",
+        ),
+        4: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(4, [Segment(min(12), HR3), Recovery(min(3))]),
+                Segment(min(5), HR2),
+                Cooldown(),
+            ],
+            name="Cruise interval run 4",
+        ),
+        5: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(4, [Segment(min(15), HR3), Recovery(min(3))]),
+                Segment(min(5), HR2),
+                Cooldown(),
+            ],
+            name="Cruise interval run 5",
+        ),
+    }
+)
+
+long_run_with_speed_play: Catalog[int, Workout] = Catalog(
+    {
+        1: lambda: Workout(
+            [
+                Warmup(mile(0.5)),
+                Segment(mile(1), HR2),
+                Repeat(8, [Segment(mile(0.25), HR3), Segment(mile(0.75), HR2)]),
+                Cooldown(mile(0.5)),
+            ],
+            name="Long run with speed play 1",
+        ),
+        2: lambda: Workout(
+            [
+                Warmup(mile(0.5)),
+                Segment(mile(1), HR2),
+                Repeat(10, [Segment(mile(0.25), HR3), Segment(mile(0.75), HR2)]),
+                Cooldown(mile(0.5)),
+            ],
+            name="Long run with speed play 2",
+        ),
+        3: lambda: Workout(
+            [
+                Warmup(mile(0.5)),
+                Segment(mile(1), HR2),
+                Repeat(12, [Segment(mile(0.25), HR3), Segment(mile(0.75), HR2)]),
+                Cooldown(mile(0.5)),
+            ],
+            name="Long run with speed play 3",
+        ),
+        4: lambda: Workout(
+            [
+                Warmup(mile(0.5)),
+                Segment(mile(1), HR2),
+                Repeat(14, [Segment(mile(0.25), HR3), Segment(mile(0.75), HR2)]),
+                Cooldown(mile(0.5)),
+            ],
+            name="Long run with speed play 4",
+        ),
+        5: lambda: Workout(
+            [
+                Warmup(mile(0.5)),
+                Segment(mile(1), HR2),
+                Repeat(16, [Segment(mile(0.25), HR3), Segment(mile(0.75), HR2)]),
+                Cooldown(mile(0.5)),
+            ],
+            name="Long run with speed play 5",
+        ),
+        6: lambda: Workout(
+            [
+                Warmup(mile(0.5)),
+                Segment(mile(1), HR2),
+                Repeat(18, [Segment(mile(0.25), HR3), Segment(mile(0.75), HR2)]),
+                Cooldown(mile(0.5)),
+            ],
+            name="Long run with speed play 6",
+        ),
+    }
+)
+
+long_run_with_fast_finish: Catalog[int, Workout] = Catalog(
+    {
+        1: lambda: Workout(
+            [Warmup(mile(0.5)), Segment(mile(8.5), HR2), Segment(mile(1), HR3)],
+            name="Long run with fast finish 1",
+        ),
+        2: lambda: Workout(
+            [Warmup(mile(0.5)), Segment(mile(10.5), HR2), Segment(mile(1), HR3)],
+            name="Long run with fast finish 2",
+        ),
+        3: lambda: Workout(
+            [Warmup(mile(0.5)), Segment(mile(12), HR2), Segment(mile(1), HR3)],
+            name="Long run with fast finish 3",
+        ),
+        4: lambda: Workout(
+            [Warmup(mile(0.5)), Segment(mile(14), HR2), Segment(mile(1), HR3)],
+            name="Long run with fast finish 4",
+        ),
+        5: lambda: Workout(
+            [Warmup(mile(0.5)), Segment(mile(15.5), HR2), Segment(mile(1), HR3)],
+            name="Long run with fast finish 5",
+        ),
+        6: lambda: Workout(
+            [Warmup(mile(0.5)), Segment(mile(17.5), HR2), Segment(mile(1), HR3)],
+            name="Long run with fast finish 6",
+        ),
+    }
+)
+
+speed_play_run: Catalog[int, Workout] = Catalog(
+    {
+        1: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(3, [Segment(min(2), HR4), Recovery()]),
+                Cooldown(),
+            ],
+            name="Speed play run 1",
+        ),
+        2: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(5, [Segment(min(1), HR5), Recovery()]),
+                Cooldown(),
+            ],
+            name="Speed play run 2",
+        ),
+        3: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(4, [Segment(min(2), HR4), Recovery()]),
+                Cooldown(),
+            ],
+            name="Speed play run 3",
+        ),
+        4: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(6, [Segment(min(1), HR5), Recovery()]),
+                Cooldown(),
+            ],
+            name="Speed play run 4",
+        ),
+        5: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(5, [Segment(min(2), HR4), Recovery()]),
+                Cooldown(),
+            ],
+            name="Speed play run 5",
+        ),
+        6: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(7, [Segment(min(1), HR5), Recovery()]),
+                Cooldown(),
+            ],
+            name="Speed play run 6",
+        ),
+        7: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(6, [Segment(min(2), HR4), Recovery()]),
+                Cooldown(),
+            ],
+            name="Speed play run 7",
+        ),
+        8: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(8, [Segment(min(1), HR5), Recovery()]),
+                Cooldown(),
+            ],
+            name="Speed play run 8",
+        ),
+        9: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(9, [Segment(min(1), HR5), Recovery()]),
+                Cooldown(),
+            ],
+            name="Speed play run 9",
+        ),
+        10: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(7, [Segment(min(2), HR4), Recovery()]),
+                Cooldown(),
+            ],
+            name="Speed play run 10",
+        ),
+        11: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(10, [Segment(min(1), HR5), Recovery()]),
+                Cooldown(),
+            ],
+            name="Speed play run 11",
+        ),
+        12: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(8, [Segment(min(2), HR4), Recovery()]),
+                Cooldown(),
+            ],
+            name="Speed play run 12",
+        ),
+        13: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(9, [Segment(min(2), HR4), Recovery()]),
+                Cooldown(),
+            ],
+            name="Speed play run 13",
+        ),
+        14: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(12, [Segment(min(1), HR5), Recovery()]),
+                Cooldown(),
+            ],
+            name="Speed play run 14",
+        ),
+    }
+)
+
+hill_repetition_run: Catalog[int, Workout] = Catalog(
+    {
+        1: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(6, [Segment(min(0.5), HR5, "Uphill"), Recovery(min(1.5))]),
+                Cooldown(),
+            ],
+            name="Hill repetition run 1",
+        ),
+        2: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(8, [Segment(min(0.5), HR5, "Uphill"), Recovery(min(1.5))]),
+                Cooldown(),
+            ],
+            name="Hill repetition run 2",
+        ),
+        3: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(6, [Segment(min(1), HR5, "Uphill"), Recovery(min(2))]),
+                Cooldown(),
+            ],
+            name="Hill repetition run 3",
+        ),
+        4: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(10, [Segment(min(0.5), HR5, "Uphill"), Recovery(min(1.5))]),
+                Cooldown(),
+            ],
+            name="Hill repetition run 4",
+        ),
+        5: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(12, [Segment(min(0.5), HR5, "Uphill"), Recovery(min(1.5))]),
+                Cooldown(),
+            ],
+            name="Hill repetition run 5",
+        ),
+        6: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(8, [Segment(min(1), HR5, "Uphill"), Recovery(min(2))]),
+                Cooldown(),
+            ],
+            name="Hill repetition run 6",
+        ),
+        7: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(6, [Segment(min(1.5), HR5, "Uphill"), Recovery(min(2.5))]),
+                Cooldown(),
+            ],
+            name="Hill repetition run 7",
+        ),
+        8: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(10, [Segment(min(1), HR5, "Uphill"), Recovery(min(2))]),
+                Cooldown(),
+            ],
+            name="Hill repetition run 8",
+        ),
+        9: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(8, [Segment(min(1.5), HR5, "Uphill"), Recovery(min(2.5))]),
+                Cooldown(),
+            ],
+            name="Hill repetition run 9",
+        ),
+        10: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(12, [Segment(min(1), HR5, "Uphill"), Recovery(min(2))]),
+                Cooldown(),
+            ],
+            name="Hill repetition run 10",
+        ),
+        11: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(10, [Segment(min(1.5), HR5, "Uphill"), Recovery(min(2.5))]),
+                Cooldown(),
+            ],
+            name="Hill repetition run 11",
+        ),
+        12: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(12, [Segment(min(1.5), HR5, "Uphill"), Recovery(min(2.5))]),
+                Cooldown(),
+            ],
+            name="Hill repetition run 12",
+        ),
+    }
+)
+
+short_interval_run: Catalog[int, Workout] = Catalog(
+    {
+        1: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(6, [Segment(min(1), HR5), Recovery(min(2))]),
+                Cooldown(),
+            ],
+            name="Short interval run 1",
+        ),
+        2: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(8, [Segment(min(1), HR5), Recovery(min(2))]),
+                Cooldown(),
+            ],
+            name="Short interval run 2",
+        ),
+        3: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(6, [Segment(min(1.5), HR5), Recovery(min(2.5))]),
+                Cooldown(),
+            ],
+            name="Short interval run 3",
+        ),
+        4: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(10, [Segment(min(1), HR5), Recovery(min(2.5))]),
+                Cooldown(),
+            ],
+            name="Short interval run 4",
+        ),
+        5: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(8, [Segment(min(1.5), HR5), Recovery(min(2))]),
+                Cooldown(),
+            ],
+            name="Short interval run 5",
+        ),
+        6: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(12, [Segment(min(1), HR5), Recovery(min(2))]),
+                Cooldown(),
+            ],
+            name="Short interval run 6",
+        ),
+        7: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(10, [Segment(min(1.5), HR5), Recovery(min(2.5))]),
+                Cooldown(),
+            ],
+            name="Short interval run 7",
+        ),
+        8: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(12, [Segment(min(1.5), HR5), Recovery(min(2.5))]),
+                Cooldown(),
+            ],
+            name="Short interval run 8",
+        ),
+    }
+)
+
+long_interval_run: Catalog[int, Workout] = Catalog(
+    {
+        1: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(3, [Segment(min(3), HR4), Recovery(min(2))]),
+                Cooldown(),
+            ],
+            name="Long interval run 1",
+        ),
+        2: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(4, [Segment(min(3), HR4), Recovery(min(2))]),
+                Cooldown(),
+            ],
+            name="Long interval run 2",
+        ),
+        3: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(3, [Segment(min(5), HR4), Recovery(min(3))]),
+                Cooldown(),
+            ],
+            name="Long interval run 3",
+        ),
+        4: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(5, [Segment(min(3), HR4), Recovery(min(2))]),
+                Cooldown(),
+            ],
+            name="Long interval run 4",
+        ),
+        5: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(6, [Segment(min(3), HR4), Recovery(min(2))]),
+                Cooldown(),
+            ],
+            name="Long interval run 5",
+        ),
+        6: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(4, [Segment(min(5), HR4), Recovery(min(3))]),
+                Cooldown(),
+            ],
+            name="Long interval run 6",
+        ),
+        7: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(5, [Segment(min(5), HR4), Recovery(min(3))]),
+                Cooldown(),
+            ],
+            name="Long interval run 7",
+        ),
+        8: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(6, [Segment(min(5), HR4), Recovery(min(3))]),
+                Cooldown(),
+            ],
+            name="Long interval run 8",
+        ),
+        9: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(7, [Segment(min(5), HR4), Recovery(min(3))]),
+                Cooldown(),
+            ],
+            name="Long interval run 9",
+        ),
+        10: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(8, [Segment(min(5), HR4), Recovery(min(3))]),
+                Cooldown(),
+            ],
+            name="Long interval run 10",
+        ),
+    }
+)
+
+mixed_interval_run: Catalog[int, Workout] = Catalog(
+    {
+        1: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Segment(min(1), HR5),
+                Recovery(),
+                Segment(min(3), HR4),
+                Recovery(),
+                Segment(min(5), HR3),
+                Recovery(),
+                Segment(min(3), HR4),
+                Recovery(),
+                Segment(min(1), HR5),
+                Cooldown(),
+            ],
+            name="Mixed interval run 1",
+        ),
+        2: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Segment(min(1.5), HR5),
+                Recovery(),
+                Segment(min(5), HR4),
+                Recovery(),
+                Segment(min(10), HR3),
+                Recovery(),
+                Segment(min(5), HR4),
+                Recovery(),
+                Segment(min(1.5), HR5),
+                Cooldown(),
+            ],
+            name="Mixed interval run 2",
+        ),
+        3: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(2, [Segment(min(1), HR5), Recovery()]),
+                Repeat(2, [Segment(min(3), HR4), Recovery()]),
+                Segment(min(10), HR3),
+                Recovery(),
+                Repeat(2, [Segment(min(3), HR4), Recovery()]),
+                Repeat(2, [Segment(min(1), HR5), Recovery()]),
+                Cooldown(),
+            ],
+            name="Mixed interval run 3",
+        ),
+        4: lambda: Workout(
+            [
+                Warmup(),
+                Segment(min(5), HR2),
+                Repeat(2, [Segment(min(1.5), HR5), Recovery(min(2.5))]),
+                Repeat(2, [Segment(min(5), HR4), Recovery()]),
+                Segment(min(10), HR3),
+                Recovery(),
+                Repeat(2, [Segment(min(1.5), HR5), Recovery()]),
+                Repeat(2, [Segment(min(5), HR4), Recovery()]),
+                Cooldown(),
+            ],
+            name="Mixed interval run 4",
+        ),
+    }
+)
 
 marathon_simulator_run: Workout = Workout(
     [